@@ -9,7 +9,16 @@ from django.contrib.admin.utils import quote
 from django.contrib.admin.views.main import ChangeList
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.sites.shortcuts import get_current_site
-from django.http import Http404, HttpResponseBadRequest, HttpResponseRedirect
+from django.core.exceptions import PermissionDenied
+from django.db.models import Exists, OuterRef, Prefetch, Q
+from django.http import (
+    Http404,
+    HttpResponseBadRequest,
+    HttpResponseNotAllowed,
+    HttpResponseRedirect,
+    JsonResponse,
+    StreamingHttpResponse,
+)
 from django.shortcuts import get_object_or_404, redirect, render
 from django.template.loader import render_to_string
 from django.template.response import TemplateResponse
@@ -20,20 +29,38 @@ from django.utils.translation import gettext_lazy as _
 from django.views.i18n import JavaScriptCatalog
 
 from djangocms_versioning.admin import ExtendedVersionAdminMixin
-from djangocms_versioning.constants import DRAFT
+from djangocms_versioning.constants import DRAFT, PUBLISHED
 from djangocms_versioning.exceptions import ConditionFailed
 from djangocms_versioning.helpers import get_admin_url, version_list_url
 from djangocms_versioning.models import Version
 from treebeard.admin import TreeAdmin
+from treebeard.exceptions import (
+    InvalidMoveToDescendant,
+    InvalidPosition,
+    PathOverflow,
+)
 
 from .compat import TREEBEARD_4_5
 from .conf import TREE_MAX_RESULT_PER_PAGE_COUNT
+from .diff import diff_menu_trees
 from .filters import LanguageFilter
 from .forms import MenuContentForm, MenuItemForm
 from .helpers import is_preview_url
 from .models import Menu, MenuContent, MenuItem
-from .utils import is_versioning_enabled, purge_menu_cache, reverse_admin_name
-from .views import ContentObjectSelect2View, MessageStorageView
+from .serialization import FORMATS, NDJSON, export_menu_content
+from .tree import restructure_menu_tree
+from .utils import (
+    is_versioning_enabled,
+    purge_menu_cache,
+    reverse_admin_name,
+    supported_models,
+)
+from .views import (
+    ContentObjectSearchView,
+    ContentObjectSelect2View,
+    MenuItemSelect2View,
+    MessageStorageView,
+)
 
 
 try:
@@ -104,6 +131,7 @@ class MenuContentAdmin(ExtendedVersionAdminMixin, admin.ModelAdmin):
             self._get_edit_link,
             self._get_manage_versions_link,
             self._get_references_link,
+            self._get_export_link,
         ]
 
         if getattr(settings, "DJANGOCMS_NAVIGATION_MAIN_NAVIGATION_ENABLED", False):
@@ -142,9 +170,8 @@ class MenuContentAdmin(ExtendedVersionAdminMixin, admin.ModelAdmin):
         return ""
 
     def _get_references_link(self, obj, request):
-        menu_content_type = ContentType.objects.get(
-            app_label=self.model._meta.app_label, model=Menu._meta.model_name,
-        )
+        # get_for_model is served from the ContentType cache, so it isn't queried for every row
+        menu_content_type = ContentType.objects.get_for_model(self.menu_model)
 
         url = reverse_lazy(
             "djangocms_references:references-index",
@@ -156,6 +183,104 @@ class MenuContentAdmin(ExtendedVersionAdminMixin, admin.ModelAdmin):
             {"url": url}
         )
 
+    def _get_export_link(self, obj, request):
+        """
+        Return an admin link that downloads the menu items tree as NDJSON
+        :param: obj: MenuContent Instance
+        :param: request: Request
+        :return: Url
+        """
+        export_url = reverse(
+            "admin:{app}_{model}_export".format(
+                app=obj._meta.app_label, model=obj._meta.model_name,
+            ),
+            args=[obj.pk],
+        )
+        return render_to_string(
+            "admin/djangocms_navigation/icons/export.html",
+            {"url": export_url}
+        )
+
+    def get_urls(self):
+        info = self.model._meta.app_label, self.model._meta.model_name
+        return [
+            path(
+                "<int:menu_content_id>/export/",
+                self.admin_site.admin_view(self.export_view),
+                name="{}_{}_export".format(*info),
+            ),
+            path(
+                "<int:menu_content_id>/compare/",
+                self.admin_site.admin_view(self.compare_view),
+                name="{}_{}_compare".format(*info),
+            ),
+        ] + super().get_urls()
+
+    def export_view(self, request, menu_content_id):
+        """
+        Streams the menu items tree of a MenuContent, see export_navigation_menu for the command line equivalent
+        :param: request: Request Object
+        :param: menu_content_id: Integer PK for menucontent
+        :return: StreamingHttpResponse or 404
+        """
+        menu_content = get_object_or_404(
+            self.model._base_manager.select_related("menu", "root"), id=menu_content_id
+        )
+        if not self.has_view_permission(request, menu_content):
+            raise PermissionDenied
+
+        export_format = request.GET.get("format", NDJSON)
+        if export_format not in FORMATS:
+            return HttpResponseBadRequest()
+        response = StreamingHttpResponse(
+            export_menu_content(menu_content, format=export_format),
+            content_type="application/x-ndjson" if export_format == NDJSON else "application/json",
+        )
+        response["Content-Disposition"] = 'attachment; filename="{}-{}.{}"'.format(
+            menu_content.menu.identifier, menu_content.language, export_format
+        )
+        return response
+
+    def compare_view(self, request, menu_content_id):
+        """
+        Renders the changes of the menu items of a MenuContent compared to the MenuContent given by
+        the compare_to parameter, by default the published version of the same menu and language
+        :param: request: Request Object
+        :param: menu_content_id: Integer PK for menucontent
+        :return: TemplateResponse or 404
+        """
+        queryset = self.model._base_manager.select_related("menu", "root")
+        menu_content = get_object_or_404(queryset, id=menu_content_id)
+        if not self.has_view_permission(request, menu_content):
+            raise PermissionDenied
+
+        compare_to_id = request.GET.get("compare_to")
+        if compare_to_id:
+            compare_to = get_object_or_404(queryset, id=compare_to_id)
+        else:
+            compare_to = self._get_published_content(menu_content)
+
+        context = dict(
+            self.admin_site.each_context(request),
+            opts=self.model._meta,
+            menu_content=menu_content,
+            compare_to=compare_to,
+            diff=diff_menu_trees(compare_to.root, menu_content.root) if compare_to else [],
+            back_url=reverse_admin_name(self.menu_item_model, "list", args=[menu_content.pk]),
+        )
+        return TemplateResponse(request, "admin/djangocms_navigation/menucontent/compare.html", context)
+
+    def _get_published_content(self, menu_content):
+        if not is_versioning_enabled(self.model):
+            return None
+        version = (
+            Version.objects.filter_by_content_grouping_values(menu_content)
+            .filter(state=PUBLISHED)
+            .exclude(object_id=menu_content.pk)
+            .first()
+        )
+        return version.content if version else None
+
     @admin.display(
         description="Main Navigation",
         boolean=True,
@@ -215,10 +340,24 @@ class MenuContentAdmin(ExtendedVersionAdminMixin, admin.ModelAdmin):
 
     def get_queryset(self, request):
         queryset = super().get_queryset(request)
-        queryset = queryset.prefetch_related('menu').filter(
+        queryset = queryset.select_related("root", "menu").filter(
             menu__site=get_current_site(request))
+        if is_versioning_enabled(self.model):
+            queryset = queryset.prefetch_related(
+                Prefetch("versions", queryset=self._get_version_queryset())
+            )
         return queryset
 
+    def _get_version_queryset(self):
+        """
+        Versions prefetched for the changelist rows, along with the author and
+        lock state displayed in the versioning and lock columns
+        """
+        related = ["created_by"]
+        if using_version_lock and hasattr(Version, "versionlock"):
+            related.append("versionlock")
+        return Version.objects.select_related(*related)
+
     def save_model(self, request, obj, form, change):
         if not change:
             title = form.cleaned_data.get("title")
@@ -270,6 +409,7 @@ class MenuItemAdmin(TreeAdmin):
     change_form_template = "admin/djangocms_navigation/menuitem/change_form.html"
     change_list_template = "admin/djangocms_navigation/menuitem/change_list.html"
     list_display = ["__str__", "get_object_url", "soft_root", 'hide_node']
+    search_fields = ["title"]
     sortable_by = ["pk"]
     list_per_page = TREE_MAX_RESULT_PER_PAGE_COUNT
 
@@ -319,6 +459,11 @@ class MenuItemAdmin(TreeAdmin):
                 self.admin_site.admin_view(self.move_node),
                 name="{}_{}_move_node".format(*info),
             ),
+            path(
+                "<int:menu_content_id>/move/batch/",
+                self.admin_site.admin_view(self.move_nodes),
+                name="{}_{}_move_nodes".format(*info),
+            ),
             path(
                 "<int:menu_content_id>/jsi18n/",
                 JavaScriptCatalog.as_view(packages=["treebeard"]),
@@ -332,6 +477,23 @@ class MenuItemAdmin(TreeAdmin):
                     self.model._meta.app_label
                 )
             ),
+            path(
+                "search/",
+                self.admin_site.admin_view(ContentObjectSearchView.as_view(
+                    menu_content_model=self.menu_content_model,
+                )),
+                name="{}_search_content_object".format(
+                    self.model._meta.app_label
+                )
+            ),
+            path(
+                "<int:menu_content_id>/select2/",
+                self.admin_site.admin_view(MenuItemSelect2View.as_view(
+                    menu_content_model=self.menu_content_model,
+                    menu_item_model=self.model,
+                )),
+                name="{}_{}_select2".format(*info),
+            ),
             path(
                 "<int:menu_content_id>/messages/",
                 self.admin_site.admin_view(MessageStorageView.as_view()),
@@ -407,12 +569,66 @@ class MenuItemAdmin(TreeAdmin):
             {"discard_url": delete_url, "disabled": disabled, "object_id": obj.id},
         )
 
+    def _get_request_cache(self, request):
+        """
+        A dict stored on the request, used to resolve the MenuContent, its Version and
+        lock state once per request for all the permission and modify checks
+        """
+        if not hasattr(request, "_navigation_admin_cache"):
+            request._navigation_admin_cache = {}
+        return request._navigation_admin_cache
+
+    def _get_menu_content(self, request):
+        """
+        Returns the MenuContent of the current request with its root and menu, only querying
+        the database on the first call for a given request
+        """
+        cache = self._get_request_cache(request)
+        key = ("menu_content", int(request.menu_content_id))
+        if key not in cache:
+            cache[key] = get_object_or_404(
+                self.menu_content_model._base_manager.select_related("root", "menu"), id=request.menu_content_id
+            )
+        return cache[key]
+
+    def _get_version(self, request):
+        """Returns the Version of the MenuContent of the current request, cached for the request"""
+        menu_content = self._get_menu_content(request)
+        cache = self._get_request_cache(request)
+        key = ("version", menu_content.pk)
+        if key not in cache:
+            cache[key] = Version.objects.get_for_content(menu_content)
+        return cache[key]
+
+    def _get_modify_error(self, request):
+        """
+        Runs check_modify on the Version of the current request once per request
+        :return: The error message if the version can't be modified by the user, otherwise None
+        """
+        version = self._get_version(request)
+        cache = self._get_request_cache(request)
+        key = ("modify", version.pk)
+        if key not in cache:
+            try:
+                version.check_modify(request.user)
+            except ConditionFailed as error:
+                cache[key] = str(error)
+            else:
+                cache[key] = None
+        return cache[key]
+
+    def _is_unlocked_for_user(self, request, obj):
+        """Returns the version lock state of obj for the request user, cached for the request"""
+        cache = self._get_request_cache(request)
+        key = ("unlocked", obj._meta.label, obj.pk)
+        if key not in cache:
+            cache[key] = content_is_unlocked_for_user(obj, request.user)
+        return cache[key]
+
     def get_queryset(self, request):
         if hasattr(request, "menu_content_id"):
-            menu_content = get_object_or_404(
-                self.menu_content_model._base_manager, id=request.menu_content_id
-            )
-            return self.model.get_tree(menu_content.root)
+            menu_content = self._get_menu_content(request)
+            return self.model.objects.filter(menu_root=menu_content.root_id).order_by("path")
         return self.model().get_tree()
 
     def change_view(self, request, object_id, menu_content_id=None, form_url="", extra_context=None):
@@ -421,20 +637,16 @@ class MenuItemAdmin(TreeAdmin):
             request.menu_content_id = menu_content_id
 
         if self._versioning_enabled:
-            menu_content = get_object_or_404(
-                self.menu_content_model._base_manager, id=menu_content_id
-            )
+            menu_content = self._get_menu_content(request)
 
             change_perm = self.has_change_permission(request, menu_content)
             if not change_perm:
                 messages.error(request, LOCK_MESSAGE)
                 return HttpResponseRedirect(version_list_url(menu_content))
 
-            version = Version.objects.get_for_content(menu_content)
-            try:
-                version.check_modify(request.user)
-            except ConditionFailed as error:
-                messages.error(request, str(error))
+            error = self._get_modify_error(request)
+            if error:
+                messages.error(request, error)
                 return HttpResponseRedirect(version_list_url(menu_content))
             # purge menu cache
             purge_menu_cache(site_id=menu_content.menu.site_id)
@@ -457,14 +669,10 @@ class MenuItemAdmin(TreeAdmin):
         if menu_content_id:
             request.menu_content_id = menu_content_id
             if self._versioning_enabled:
-                menu_content = get_object_or_404(
-                    self.menu_content_model._base_manager, id=menu_content_id
-                )
-                version = Version.objects.get_for_content(menu_content)
-                try:
-                    version.check_modify(request.user)
-                except ConditionFailed as error:
-                    messages.error(request, str(error))
+                menu_content = self._get_menu_content(request)
+                error = self._get_modify_error(request)
+                if error:
+                    messages.error(request, error)
                     return HttpResponseRedirect(version_list_url(menu_content))
                 # purge menu cache
                 purge_menu_cache(site_id=menu_content.menu.site_id)
@@ -484,9 +692,7 @@ class MenuItemAdmin(TreeAdmin):
         extra_context = extra_context or {}
 
         request.menu_content_id = menu_content_id
-        menu_content = get_object_or_404(
-            self.menu_content_model._base_manager, id=menu_content_id
-        )
+        menu_content = self._get_menu_content(request)
         extra_context["title"] = f"Preview Menu: {str(menu_content)}"
         extra_context["menu_content"] = menu_content
         return super().changelist_view(request, extra_context)
@@ -510,15 +716,11 @@ class MenuItemAdmin(TreeAdmin):
 
         if menu_content_id:
             request.menu_content_id = menu_content_id
-            menu_content = get_object_or_404(
-                self.menu_content_model._base_manager, id=menu_content_id
-            )
+            menu_content = self._get_menu_content(request)
             if self._versioning_enabled:
-                version = Version.objects.get_for_content(menu_content)
-                try:
-                    version.check_modify(request.user)
-                except ConditionFailed as error:
-                    messages.error(request, str(error))
+                error = self._get_modify_error(request)
+                if error:
+                    messages.error(request, error)
                     return HttpResponseRedirect(version_list_url(menu_content))
             extra_context["title"] = "Edit Menu: {}".format(menu_content.__str__())
             extra_context["menu_content"] = menu_content
@@ -616,9 +818,7 @@ class MenuItemAdmin(TreeAdmin):
             )
             extra_context["list_url"] = list_url
             if self._versioning_enabled:
-                menu_content = get_object_or_404(
-                    self.menu_content_model._base_manager, id=menu_content_id
-                )
+                menu_content = self._get_menu_content(request)
                 delete_perm = self.has_delete_permission(request, menu_content)
                 if not delete_perm:
                     messages.error(request, LOCK_MESSAGE)
@@ -631,11 +831,9 @@ class MenuItemAdmin(TreeAdmin):
                         request, _("This item is the root of a menu, therefore it cannot be deleted.")
                     )
                     return HttpResponseRedirect(list_url)
-                version = Version.objects.get_for_content(menu_content)
-                try:
-                    version.check_modify(request.user)
-                except ConditionFailed as error:
-                    messages.error(request, str(error))
+                error = self._get_modify_error(request)
+                if error:
+                    messages.error(request, error)
                     return HttpResponseRedirect(version_list_url(menu_content))
 
                 extra_context["menu_name"] = menu_item
@@ -721,24 +919,28 @@ class MenuItemAdmin(TreeAdmin):
 
         return HttpResponseRedirect(url)
 
-    def move_node(self, request, menu_content_id):
+    def _get_move_error(self, request, menu_content_id):
+        """
+        Runs the versioning and lock checks shared by the move endpoints
+        :param: request: Request Object
+        :param: menu_content_id: Integer PK for menucontent
+        :return: An error message if the menu can't be restructured, otherwise None
+        """
         # Disallow moving of a node on anything other than a draft version
         if self._versioning_enabled:
-            menu_content = get_object_or_404(
-                self.menu_content_model._base_manager, id=menu_content_id
-            )
             request.menu_content_id = menu_content_id
+            menu_content = self._get_menu_content(request)
             change_perm = self.has_change_permission(request, menu_content)
             if not change_perm:
-                messages.error(request, LOCK_MESSAGE)
-                return HttpResponseBadRequest(LOCK_MESSAGE)
+                return LOCK_MESSAGE
 
-            version = Version.objects.get_for_content(menu_content)
-            try:
-                version.check_modify(request.user)
-            except ConditionFailed as error:
-                messages.error(request, str(error))
-                return HttpResponseBadRequest(str(error))
+            return self._get_modify_error(request)
+
+    def move_node(self, request, menu_content_id):
+        error = self._get_move_error(request, menu_content_id)
+        if error:
+            messages.error(request, error)
+            return HttpResponseBadRequest(error)
 
         # Disallow moving of a node outside of the menu it is part of
         if request.POST.get("parent_id") == "0":
@@ -748,6 +950,38 @@ class MenuItemAdmin(TreeAdmin):
 
         return super().move_node(request)
 
+    def move_nodes(self, request, menu_content_id):
+        """
+        Applies several moves to a menu in a single request and transaction. Expects POST data with
+        a JSON encoded "moves" list of {"node_id", "sibling_id", "as_child"} objects, applied in order
+        with the same semantics as move_node, and / or a JSON encoded "structure" list of
+        {"node_id", "parent_id", "position"} objects.
+        :param: request: Request Object
+        :param: menu_content_id: Integer PK for menucontent
+        :return: JsonResponse with the number of updated menu items, or 400
+        """
+        if request.method != "POST":
+            return HttpResponseNotAllowed(["POST"])
+
+        error = self._get_move_error(request, menu_content_id)
+        if error:
+            messages.error(request, error)
+            return HttpResponseBadRequest(error)
+
+        request.menu_content_id = menu_content_id
+        menu_content = self._get_menu_content(request)
+        try:
+            moves = json.loads(request.POST.get("moves") or "[]")
+            structure = json.loads(request.POST.get("structure") or "[]")
+            updated = restructure_menu_tree(menu_content.root, moves=moves, structure=structure)
+        except (ValueError, KeyError, TypeError, InvalidMoveToDescendant, InvalidPosition, PathOverflow) as error:
+            message = _("Exception raised while moving nodes: %s") % error
+            messages.error(request, message)
+            return HttpResponseBadRequest(message)
+
+        messages.info(request, _("Menu items moved successfully"))
+        return JsonResponse({"updated": updated})
+
     def has_add_permission(self, request):
         if not hasattr(request, "menu_content_id"):
             return False
@@ -758,7 +992,7 @@ class MenuItemAdmin(TreeAdmin):
             return False
 
         if obj and using_version_lock:
-            unlocked = content_is_unlocked_for_user(obj, request.user)
+            unlocked = self._is_unlocked_for_user(request, obj)
             if not unlocked:
                 return False
 
@@ -774,7 +1008,7 @@ class MenuItemAdmin(TreeAdmin):
             return False
 
         if obj and using_version_lock:
-            unlocked = content_is_unlocked_for_user(obj, request.user)
+            unlocked = self._is_unlocked_for_user(request, obj)
             if not unlocked:
                 return False
 
@@ -783,9 +1017,35 @@ class MenuItemAdmin(TreeAdmin):
     def get_changelist(self, request, **kwargs):
         return MenuItemChangeList
 
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Searches the menu items of the tree by title, and by the fields of their linked content
+        configured in navigation_models (e.g. the page title, slug and url path). The matched items
+        are returned together with their ancestors so that the tree only shows the relevant branches.
+        Ancestors are found from the path prefixes of the matches, in the same query.
+        """
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+
+        query = Q(title__icontains=search_term)
+        navigation_models = supported_models(self.menu_content_model)
+        content_types = ContentType.objects.get_for_models(*navigation_models)
+        for model, search_fields in navigation_models.items():
+            if not search_fields:
+                # An empty Q would match every object of the model
+                continue
+            content_query = Q(**{field: search_term for field in search_fields}, _connector=Q.OR)
+            query |= Q(
+                content_type=content_types[model],
+                object_id__in=model._base_manager.filter(content_query).values("pk"),
+            )
+        matches = queryset.filter(query).filter(path__startswith=OuterRef("path"))
+        return queryset.filter(Exists(matches.order_by())), False
+
     def get_form(self, request, obj=None, **kwargs):
         form_class = super().get_form(request, obj, **kwargs)
-        menu_root = get_object_or_404(self.model, menucontent=request.menu_content_id)
+        menu_root = self._get_menu_content(request).root
 
         class Form(form_class):
             def __new__(cls, *args, **kwargs):
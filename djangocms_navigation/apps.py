@@ -7,3 +7,48 @@ from django.utils.translation import gettext_lazy as _
 class NavigationConfig(AppConfig):
     name = "djangocms_navigation"
     verbose_name = _("django CMS Navigation")
+
+    def ready(self):
+        from django.db.models.signals import post_delete, post_save
+
+        from cms.models import PageUrl
+        from cms.signals import post_obj_operation
+
+        from djangocms_versioning.signals import post_version_operation
+
+        from .handlers import (
+            invalidate_select2_cache_on_version_operation,
+            on_page_url_change,
+            purge_menu_cache_on_version_operation,
+            refresh_menu_item_urls_on_menu_item_save,
+            refresh_menu_item_urls_on_page_operation,
+            refresh_menu_item_urls_on_version_operation,
+        )
+
+        post_version_operation.connect(
+            invalidate_select2_cache_on_version_operation,
+            dispatch_uid="djangocms_navigation_invalidate_select2_cache",
+        )
+        post_version_operation.connect(
+            refresh_menu_item_urls_on_version_operation,
+            dispatch_uid="djangocms_navigation_refresh_menu_item_urls_on_version_operation",
+        )
+        post_obj_operation.connect(
+            refresh_menu_item_urls_on_page_operation,
+            dispatch_uid="djangocms_navigation_refresh_menu_item_urls_on_page_operation",
+        )
+        post_save.connect(
+            refresh_menu_item_urls_on_menu_item_save,
+            sender=self.get_model("MenuItem"),
+            dispatch_uid="djangocms_navigation_refresh_menu_item_urls_on_menu_item_save",
+        )
+        post_version_operation.connect(
+            purge_menu_cache_on_version_operation,
+            dispatch_uid="djangocms_navigation_purge_menu_cache_on_version_operation",
+        )
+        for name, signal in (("save", post_save), ("delete", post_delete)):
+            signal.connect(
+                on_page_url_change,
+                sender=PageUrl,
+                dispatch_uid="djangocms_navigation_on_page_url_{}".format(name),
+            )
@@ -0,0 +1,147 @@
+import hashlib
+import time
+import uuid
+
+from django.core.cache import cache
+
+from .conf import NODE_CACHE_TTL, NODE_REBUILD_WAIT
+
+
+SELECT2_CACHE_PREFIX = "djangocms_navigation_select2"
+
+NODE_CACHE_PREFIX = "djangocms_navigation_nodes"
+
+# Seconds after which the rebuild lock of a worker that died is released
+NODE_REBUILD_LOCK_TIMEOUT = 30
+
+# Seconds between two checks of a worker waiting for the rebuilt nodes
+NODE_REBUILD_POLL_INTERVAL = 0.05
+
+
+def _get_generation_key(content_type_id):
+    return "{}_generation_{}".format(SELECT2_CACHE_PREFIX, content_type_id)
+
+
+def get_select2_cache_generation(content_type_id):
+    """
+    The cached select2 results of a content type are stored under its current generation,
+    moving to a new generation invalidates all of them at once.
+    """
+    return cache.get_or_set(_get_generation_key(content_type_id), lambda: time.time_ns(), None)
+
+
+def get_select2_cache_key(content_type_id, generation, params):
+    """
+    :param params: A tuple of the request parameters the results depend on
+    """
+    digest = hashlib.sha1(repr(params).encode("utf-8")).hexdigest()
+    return "{}_{}_{}_{}".format(SELECT2_CACHE_PREFIX, content_type_id, generation, digest)
+
+
+def invalidate_select2_cache(content_type_id):
+    cache.set(_get_generation_key(content_type_id), time.time_ns(), None)
+
+
+def _get_node_generation_keys(site_id, language):
+    """The generation keys of all sites, of the site and of the site language"""
+    return [
+        "{}_generation".format(NODE_CACHE_PREFIX),
+        "{}_generation_{}".format(NODE_CACHE_PREFIX, site_id),
+        "{}_generation_{}_{}".format(NODE_CACHE_PREFIX, site_id, language),
+    ]
+
+
+def get_navigation_cache_generation(site_id, language):
+    """
+    The cached navigation nodes of a site language are only valid for the generation they were
+    built in, which changes when the nodes of all sites, of the site or of the language are invalidated.
+    """
+    keys = _get_node_generation_keys(site_id, language)
+    generations = cache.get_many(keys)
+    missing = [key for key in keys if key not in generations]
+    if missing:
+        # Workers starting together must agree on the generation: the first add wins and
+        # the others read its value back
+        for key in missing:
+            cache.add(key, time.time_ns(), None)
+        generations.update(cache.get_many(missing))
+    return tuple(generations[key] for key in keys)
+
+
+def get_navigation_cache_key(site_id, language):
+    return "{}_{}_{}".format(NODE_CACHE_PREFIX, site_id, language)
+
+
+def get_cached_navigation_nodes(site_id, language):
+    """:return: The navigation nodes cached for the site language, None if they aren't cached or outdated"""
+    entry = cache.get(get_navigation_cache_key(site_id, language))
+    if entry is None or entry["generation"] != get_navigation_cache_generation(site_id, language):
+        return None
+    return entry["nodes"]
+
+
+def set_cached_navigation_nodes(site_id, language, nodes, generation=None):
+    """
+    :param generation: The generation read before building the nodes, so that nodes built while
+        the cache was invalidated are stored as outdated
+    """
+    if generation is None:
+        generation = get_navigation_cache_generation(site_id, language)
+    cache.set(
+        get_navigation_cache_key(site_id, language), {"generation": generation, "nodes": nodes}, NODE_CACHE_TTL
+    )
+
+
+def _wait_for_navigation_nodes(key, lock_key, generation):
+    """Waits up to NODE_REBUILD_WAIT seconds for the worker holding the lock to store the nodes"""
+    deadline = time.monotonic() + NODE_REBUILD_WAIT
+    while time.monotonic() < deadline:
+        time.sleep(NODE_REBUILD_POLL_INTERVAL)
+        entry = cache.get(key)
+        if entry is not None and entry["generation"] == generation:
+            return entry["nodes"]
+        if cache.get(lock_key) is None:
+            break
+    return None
+
+
+def get_or_build_navigation_nodes(site_id, language, build):
+    """
+    Returns the cached navigation nodes of a site language, building them with build() when they
+    are missing or outdated. Only the worker acquiring the rebuild lock, with an atomic cache add,
+    builds them. The other workers are served the outdated nodes if there are any, or wait for the
+    rebuilt ones, and build them without storing them if the wait times out.
+    """
+    key = get_navigation_cache_key(site_id, language)
+    generation = get_navigation_cache_generation(site_id, language)
+    entry = cache.get(key)
+    if entry is not None and entry["generation"] == generation:
+        return entry["nodes"]
+
+    lock_key = "{}_lock".format(key)
+    token = uuid.uuid4().hex
+    if not cache.add(lock_key, token, NODE_REBUILD_LOCK_TIMEOUT):
+        if entry is not None:
+            return entry["nodes"]
+        nodes = _wait_for_navigation_nodes(key, lock_key, generation)
+        return nodes if nodes is not None else build()
+
+    try:
+        nodes = build()
+        set_cached_navigation_nodes(site_id, language, nodes, generation)
+    finally:
+        if cache.get(lock_key) == token:
+            cache.delete(lock_key)
+    return nodes
+
+
+def invalidate_navigation_cache(site_id=None, language=None):
+    """Invalidates the cached navigation nodes of a site language, of all the languages of a site or of all sites"""
+    keys = _get_node_generation_keys(site_id, language)
+    if site_id is None:
+        key = keys[0]
+    elif language is None:
+        key = keys[1]
+    else:
+        key = keys[2]
+    cache.set(key, time.time_ns(), None)
@@ -1,12 +1,16 @@
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
+from django.db.models.signals import post_delete, post_save
 
 from cms.app_base import CMSAppConfig, CMSAppExtension
 from cms.models import Page
 from cms.utils.i18n import get_language_tuple
 
+from .handlers import refresh_menu_item_urls_on_content_change
+from .helpers import store_menu_item_urls
 from .models import MenuContent, MenuItem, NavigationPlugin
 from .rendering import render_navigation_content
+from .tree import clone_menu_tree, get_copy_plan
 from .utils import purge_menu_cache
 
 
@@ -19,6 +23,8 @@ class NavigationCMSExtension(CMSAppExtension):
             navigation_app_models = getattr(cms_config, "navigation_models")
             if isinstance(navigation_app_models, dict):
                 self.navigation_apps_models.update(navigation_app_models)
+                for model in navigation_app_models:
+                    self.connect_signals(model)
             else:
                 raise ImproperlyConfigured(
                     "navigation configuration must be a dictionary object"
@@ -28,13 +34,20 @@ class NavigationCMSExtension(CMSAppExtension):
                 "cms_config.py must have navigation_models attribute"
             )
 
+    def connect_signals(self, model):
+        """Deletes the stored URLs of the menu items linked to an object when it changes"""
+        for name, signal in (("save", post_save), ("delete", post_delete)):
+            signal.connect(
+                refresh_menu_item_urls_on_content_change,
+                sender=model,
+                dispatch_uid="djangocms_navigation_refresh_menu_item_urls_on_{}".format(name),
+            )
+
 
-def _get_model_fields(instance, model, field_exclusion_list=[]):
-    field_exclusion_list.append(model._meta.pk.name)
+def _get_model_fields(instance, model, field_exclusion_list=()):
     return {
         field.name: getattr(instance, field.name)
-        for field in model._meta.fields
-        if field.name not in field_exclusion_list
+        for field in get_copy_plan(model, exclude=tuple(field_exclusion_list))
     }
 
 
@@ -42,27 +55,23 @@ def copy_menu_content(original_content):
     """Copy the MenuContent object and deepcopy its menu items."""
     # Copy root menu item
     original_root = original_content.root
-    root_fields = _get_model_fields(original_root, MenuItem, field_exclusion_list=["path", "depth"])
+    root_fields = _get_model_fields(original_root, MenuItem, field_exclusion_list=("path", "depth", "menu_root"))
     new_root = MenuItem.add_root(**root_fields)
 
     # Copy MenuContent object
-    content_fields = _get_model_fields(original_content, MenuContent, field_exclusion_list=['root'])
+    content_fields = _get_model_fields(original_content, MenuContent, field_exclusion_list=("root",))
     content_fields["root"] = new_root
     new_content = MenuContent.objects.create(**content_fields)
 
     # Copy menu items
-    to_create = []
-    for item in MenuItem.get_tree(original_root).exclude(pk=original_root.pk):
-        item_fields = _get_model_fields(item, MenuItem, field_exclusion_list=['path'])
-        item_fields["path"] = new_root.path + item.path[MenuItem.steplen:]
-        to_create.append(MenuItem(**item_fields))
-    MenuItem.objects.bulk_create(to_create)
+    clone_menu_tree(original_root, new_root)
 
     return new_content
 
 
 def on_menu_content_publish(version):
     menu_content = version.content
+    store_menu_item_urls(MenuItem.get_tree(menu_content.root).filter(depth__gt=1), [menu_content.language])
     purge_menu_cache(site_id=menu_content.menu.site_id)
 
 
@@ -1,5 +1,9 @@
+from collections import defaultdict
+
 from django.conf import settings
-from django.db.models import Q
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import prefetch_related_objects
+from django.utils.translation import override
 
 from cms.cms_menus import CMSMenu as OriginalCMSMenu
 from cms.models import Page
@@ -10,7 +14,13 @@ from menus.menu_pool import menu_pool
 
 from djangocms_versioning.constants import DRAFT, PUBLISHED
 
-from .models import MenuContent, MenuItem
+from .cache import (
+    get_navigation_cache_generation,
+    get_or_build_navigation_nodes,
+    set_cached_navigation_nodes,
+)
+from .conf import MENU_ITEM_URL_CACHE, NODE_CACHE_TTL
+from .models import MenuContent, MenuItem, MenuItemUrl
 from .utils import (
     get_latest_page_content_for_page_grouper,
     get_versionable_for_content,
@@ -21,19 +31,40 @@ from .utils import (
 class MenuItemNavigationNode(NavigationNode):
 
     def __init__(self, *args, **kwargs):
-        self.content = kwargs.pop('content')
+        if "content" in kwargs:
+            self._content = kwargs.pop("content")
+        self.content_type_id = kwargs.pop("content_type_id", None)
+        self.object_id = kwargs.pop("object_id", None)
+        # Whether the node links to the home page, found when building the nodes so that it
+        # doesn't require loading the content
+        self.is_home = kwargs.pop("is_home", False)
         super().__init__(*args, **kwargs)
 
+    @property
+    def content(self):
+        """The linked object, loaded on first access when the node was built from a stored URL"""
+        if not hasattr(self, "_content"):
+            self._content = None
+            if self.object_id is not None:
+                model = ContentType.objects.get_for_id(self.content_type_id).model_class()
+                self._content = model._base_manager.filter(pk=self.object_id).first()
+        return self._content
+
+    def links_to(self, model):
+        """Whether the node links to an object of model, without loading it"""
+        return self.object_id is not None and self.content_type_id == ContentType.objects.get_for_model(model).pk
+
     def is_selected(self, request):
         content = getattr(request, "current_page", None)
-        if self.content:
-            return content == self.content
+        if content is not None and self.links_to(content.__class__):
+            return content.pk == self.object_id
         return False
 
 
 class CMSMenu(Menu):
     menu_content_model = MenuContent
     menu_item_model = MenuItem
+    menu_item_url_model = MenuItemUrl
 
     def get_roots(self, request):
         language = get_language_from_request(request)
@@ -57,6 +88,32 @@ class CMSMenu(Menu):
             queryset = queryset.filter(menucontent__in=menucontents)
         return queryset
 
+    def get_menu_contents_for_languages(self, site, languages):
+        """
+        Fetches the published menus of site in all languages in one query, applying the same
+        rules as get_roots for each language.
+
+        :return: A dict of the MenuContents of each language, ordered as their roots
+        """
+        versionable = get_versionable_for_content(self.menu_content_model)
+        if versionable:
+            queryset = versionable.distinct_groupers(versions__state__in=[PUBLISHED], language__in=languages)
+        else:
+            queryset = self.menu_content_model._base_manager.all()
+        queryset = queryset.filter(menu__site=site).select_related("menu", "root").order_by("root__path")
+        menu_contents = {language: [] for language in languages}
+        for menu_content in queryset:
+            # Without versioning get_roots doesn't filter the menus by language
+            for language in [menu_content.language] if versionable else languages:
+                menu_contents[language].append(menu_content)
+
+        if versionable and getattr(settings, "DJANGOCMS_NAVIGATION_MAIN_NAVIGATION_ENABLED", False):
+            for language, contents in menu_contents.items():
+                main_navigation = [menu_content for menu_content in contents if menu_content.menu.main_navigation]
+                if main_navigation:
+                    menu_contents[language] = main_navigation
+        return menu_contents
+
     def get_main_navigation(self, menucontents, site):
         """
         Takes a queryset of MenuContent objects, filters to include only those where the related Menu object has been
@@ -72,11 +129,11 @@ class CMSMenu(Menu):
         return main_navigation
 
     def get_menu_nodes(self, roots):
-        root_paths = roots.values_list("path", flat=True)
-        path_q = Q()
-        for path in root_paths:
-            path_q |= Q(path__startswith=path) & ~Q(path=path)
-        return self.menu_item_model.get_tree().filter(path_q).order_by("path")
+        return (
+            self.menu_item_model.get_tree()
+            .filter(menu_root__in=roots, depth__gt=1)
+            .order_by("path")
+        )
 
     def get_url(self, request, obj):
         # If the node is attached to a page and we are on the admin edit
@@ -92,29 +149,108 @@ class CMSMenu(Menu):
             return ""
         return obj.get_absolute_url() if obj else ""
 
-    def get_navigation_nodes(self, nodes, root_ids, request):
+    def use_url_cache(self, request):
+        # The preview and edit modes link to the preview of the latest version rather than to the content URL
+        return MENU_ITEM_URL_CACHE and self.menu_item_url_model is not None and not is_preview_or_edit_mode(request)
+
+    def get_cached_urls(self, root_ids, language):
+        """:return: A dict of the stored URL of each menu item below the roots of root_ids in language"""
+        return dict(
+            self.menu_item_url_model.objects.filter(menu_item__menu_root__in=root_ids, language=language)
+            .values_list("menu_item_id", "url")
+        )
+
+    def get_home_page_ids(self, menu_items, page_content_type_id):
+        """:return: The pks of the home pages linked from menu_items, found with one query"""
+        page_ids = [item.object_id for item in menu_items if item.content_type_id == page_content_type_id]
+        if not page_ids:
+            return set()
+        return set(Page._base_manager.filter(pk__in=page_ids, is_home=True).values_list("pk", flat=True))
+
+    def get_navigation_nodes(self, nodes, root_ids, request, language=None):
+        language = language or get_language_from_request(request)
+        cached_urls = self.get_cached_urls(list(root_ids), language) if self.use_url_cache(request) else {}
+        nodes = list(nodes)
+        # The linked objects are only loaded to resolve the URLs that aren't stored
+        prefetch_related_objects([node for node in nodes if node.pk not in cached_urls], "content")
+        page_content_type_id = ContentType.objects.get_for_model(Page).pk
+        home_page_ids = self.get_home_page_ids(nodes, page_content_type_id)
+        pk_by_path = {}
         for node in nodes:
-            parent = node.get_parent()
-            url = self.get_url(request, node.content)
-            if parent:
-                if parent.id in root_ids:
-                    parent_id = root_ids[parent.id]
-                else:
-                    parent_id = parent.id
+            # The nodes are ordered by path, so the parent of a node is either the root or already seen
+            parent_pk = pk_by_path.get(node._get_parent_path_from_path(node.path), node.menu_root_id)
+            pk_by_path[node.path] = node.pk
+            kwargs = {}
+            url = cached_urls.get(node.pk)
+            if url is None:
+                url = self.get_url(request, node.content)
+                kwargs["content"] = node.content
             yield MenuItemNavigationNode(
                 title=node.title,
                 url=url,
                 id=node.pk,
-                parent_id=parent_id if parent else None,
-                content=node.content,
+                parent_id=root_ids.get(parent_pk, parent_pk),
+                content_type_id=node.content_type_id,
+                object_id=node.object_id,
                 visible=not node.hide_node,
                 attr={
                     "link_target": node.link_target,
                     "soft_root": node.soft_root
                 },
+                is_home=node.content_type_id == page_content_type_id and node.object_id in home_page_ids,
+                **kwargs
             )
 
+    def use_node_cache(self, request):
+        # The edit and preview modes show draft menus and link to previews
+        return bool(NODE_CACHE_TTL) and not is_preview_or_edit_mode(request)
+
     def get_nodes(self, request):
+        if not self.use_node_cache(request):
+            return self.build_nodes(request)
+        return get_or_build_navigation_nodes(
+            get_current_site().pk, get_language_from_request(request), lambda: self.build_nodes(request)
+        )
+
+    def build_nodes_for_languages(self, request, site, languages):
+        """
+        Builds the live navigation nodes of site in several languages in one pass: the menus of
+        all languages are fetched with one query and their menu items with another.
+
+        :return: A dict of the navigation nodes of each language
+        """
+        menu_contents = self.get_menu_contents_for_languages(site, languages)
+        root_pks = {menu_content.root_id for contents in menu_contents.values() for menu_content in contents}
+        items_by_root = defaultdict(list)
+        for item in self.get_menu_nodes(root_pks):
+            items_by_root[item.menu_root_id].append(item)
+
+        nodes = {}
+        for language, contents in menu_contents.items():
+            root_navigation_nodes = []
+            root_ids = {}
+            items = []
+            for menu_content in contents:
+                identifier = menu_content.menu.root_id
+                root_navigation_nodes.append(MenuItemNavigationNode(title="", url="", id=identifier, content=None))
+                root_ids[menu_content.root_id] = identifier
+                items.extend(items_by_root[menu_content.root_id])
+            items.sort(key=lambda item: item.path)
+            with override(language):
+                nodes[language] = root_navigation_nodes + list(
+                    self.get_navigation_nodes(items, root_ids, request, language)
+                )
+        return nodes
+
+    def cache_nodes_for_languages(self, request, site, languages):
+        """Builds and caches the live navigation nodes of site in all languages at once"""
+        generations = {language: get_navigation_cache_generation(site.pk, language) for language in languages}
+        nodes = self.build_nodes_for_languages(request, site, languages)
+        for language, language_nodes in nodes.items():
+            set_cached_navigation_nodes(site.pk, language, language_nodes, generations[language])
+        return nodes
+
+    def build_nodes(self, request):
         navigations = self.get_roots(request)
         root_navigation_nodes = []
         root_ids = {}
@@ -143,7 +279,7 @@ class NavigationSelector(Modifier):
         if breadcrumb:
             home = None
             for node in nodes:
-                if node.content and isinstance(node.content, Page) and node.content.is_home:
+                if node.is_home:
                     home = node
                     break
             if home and not home.visible:
@@ -6,3 +6,31 @@ from django.conf import settings
 TREE_MAX_RESULT_PER_PAGE_COUNT = getattr(
     settings, "DJANGOCMS_NAVIGATION_TREE_MAX_RESULT_PER_PAGE_COUNT", sys.maxsize
 )
+
+SELECT2_PAGE_SIZE = getattr(
+    settings, "DJANGOCMS_NAVIGATION_SELECT2_PAGE_SIZE", 30
+)
+
+SELECT2_CACHE_TTL = getattr(
+    settings, "DJANGOCMS_NAVIGATION_SELECT2_CACHE_TTL", 30
+)
+
+SEARCH_BACKEND = getattr(
+    settings, "DJANGOCMS_NAVIGATION_SEARCH_BACKEND", "djangocms_navigation.search.SubquerySearchBackend"
+)
+
+ARCHIVED_MENU_RETENTION_DAYS = getattr(
+    settings, "DJANGOCMS_NAVIGATION_ARCHIVED_MENU_RETENTION_DAYS", 90
+)
+
+MENU_ITEM_URL_CACHE = getattr(
+    settings, "DJANGOCMS_NAVIGATION_MENU_ITEM_URL_CACHE", True
+)
+
+NODE_CACHE_TTL = getattr(
+    settings, "DJANGOCMS_NAVIGATION_NODE_CACHE_TTL", 3600
+)
+
+NODE_REBUILD_WAIT = getattr(
+    settings, "DJANGOCMS_NAVIGATION_NODE_REBUILD_WAIT", 2
+)
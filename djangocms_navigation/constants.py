@@ -26,3 +26,7 @@ PLUGIN_URL_NAME_PREFIX = "djangocms_navigation"
 SELECT2_CONTENT_OBJECT_URL_NAME = "{}_select2_content_object".format(
     PLUGIN_URL_NAME_PREFIX
 )
+
+SEARCH_CONTENT_OBJECT_URL_NAME = "{}_search_content_object".format(
+    PLUGIN_URL_NAME_PREFIX
+)
@@ -0,0 +1,174 @@
+from bisect import bisect_left
+from collections import defaultdict, deque
+
+from .models import MenuItem
+
+
+ADDED = "added"
+REMOVED = "removed"
+MOVED = "moved"
+CHANGED = "changed"
+UNCHANGED = "unchanged"
+
+# Fields compared between matched menu items
+DIFF_FIELDS = ("title", "content_type_id", "object_id", "link_target", "soft_root", "hide_node")
+
+
+class MenuItemDiff:
+    """The difference of a menu item between two versions of a menu"""
+
+    def __init__(self, old=None, new=None, moved=False, changed_fields=()):
+        """
+        :param old: The values of the item in the old tree, None if it was added
+        :param new: The values of the item in the new tree, None if it was removed
+        """
+        self.old = old
+        self.new = new
+        self.moved = moved
+        self.changed_fields = list(changed_fields)
+
+    @property
+    def item(self):
+        return self.new if self.new is not None else self.old
+
+    @property
+    def status(self):
+        if self.old is None:
+            return ADDED
+        if self.new is None:
+            return REMOVED
+        if self.moved:
+            return MOVED
+        if self.changed_fields:
+            return CHANGED
+        return UNCHANGED
+
+
+def _load_tree(root, item_model):
+    """Loads the values of the items of a tree in one query, with the pk of their parent"""
+    items = list(
+        item_model._base_manager.filter(menu_root=root)
+        .order_by("path")
+        .values("pk", "path", "depth", *DIFF_FIELDS)
+    )
+    pk_by_path = {}
+    for item in items:
+        item["parent"] = pk_by_path.get(item_model._get_parent_path_from_path(item["path"]))
+        item["relative_path"] = item["path"][len(root.path):]
+        pk_by_path[item["path"]] = item["pk"]
+    return items
+
+
+def _content_key(item, *fields):
+    if item["content_type_id"] is None:
+        return None
+    return (item["content_type_id"], item["object_id"]) + tuple(item[field] for field in fields)
+
+
+# Keys used to match items, from the most to the least specific
+MATCH_KEYS = (
+    lambda item: _content_key(item, "title", "relative_path"),
+    lambda item: _content_key(item, "title"),
+    lambda item: _content_key(item),
+    lambda item: (item["title"], item["relative_path"]),
+    lambda item: (item["title"],),
+)
+
+
+def _match_items(old_items, new_items):
+    """
+    Matches the items of both trees in a few passes over hash buckets, each pass using a less
+    specific key on the items left unmatched. The roots are always matched together.
+    :return: A dict of the old item matched to each new item pk
+    """
+    matches = {new_items[0]["pk"]: old_items[0]}
+    unmatched_old = old_items[1:]
+    unmatched_new = new_items[1:]
+    for get_key in MATCH_KEYS:
+        buckets = defaultdict(deque)
+        for item in unmatched_old:
+            key = get_key(item)
+            if key is not None:
+                buckets[key].append(item)
+        still_unmatched_new = []
+        for item in unmatched_new:
+            bucket = buckets.get(get_key(item))
+            if bucket:
+                matches[item["pk"]] = bucket.popleft()
+            else:
+                still_unmatched_new.append(item)
+        matched_old = {old["pk"] for old in matches.values()}
+        unmatched_old = [item for item in unmatched_old if item["pk"] not in matched_old]
+        unmatched_new = still_unmatched_new
+    return matches
+
+
+def _get_reordered(positions):
+    """
+    Returns the indexes of the positions outside of their longest increasing subsequence,
+    the smallest set of siblings to move to get from the old order to the new one.
+    """
+    tails = []
+    tail_indexes = []
+    previous = [None] * len(positions)
+    for index, position in enumerate(positions):
+        length = bisect_left(tails, position)
+        if length == len(tails):
+            tails.append(position)
+            tail_indexes.append(index)
+        else:
+            tails[length] = position
+            tail_indexes[length] = index
+        previous[index] = tail_indexes[length - 1] if length else None
+    in_order = set()
+    index = tail_indexes[-1] if tail_indexes else None
+    while index is not None:
+        in_order.add(index)
+        index = previous[index]
+    return {index for index in range(len(positions)) if index not in in_order}
+
+
+def diff_menu_trees(old_root, new_root, item_model=MenuItem):
+    """
+    Compares the trees below two menu roots, typically of two versions of a MenuContent.
+    Each tree is loaded with one query and items are matched by content reference, title and
+    position using hash lookups, so the diff takes linear time rather than comparing every pair.
+
+    :return: A list of MenuItemDiff, the items of the new tree in tree order followed by the removed items
+    """
+    old_items = _load_tree(old_root, item_model)
+    new_items = _load_tree(new_root, item_model)
+    matches = _match_items(old_items, new_items)
+    new_pk_by_old_pk = {old["pk"]: new_pk for new_pk, old in matches.items()}
+
+    # Items moved to another parent
+    moved = set()
+    for new_item in new_items[1:]:
+        old_item = matches.get(new_item["pk"])
+        if old_item is not None and new_pk_by_old_pk.get(old_item["parent"]) != new_item["parent"]:
+            moved.add(new_item["pk"])
+
+    # Items reordered among the siblings that kept their parent
+    old_positions = {}
+    for old_item in old_items:
+        old_positions[old_item["pk"]] = len(old_positions)
+    siblings = defaultdict(list)
+    for new_item in new_items[1:]:
+        if new_item["pk"] in matches and new_item["pk"] not in moved:
+            siblings[new_item["parent"]].append(new_item["pk"])
+    for sibling_pks in siblings.values():
+        positions = [old_positions[matches[pk]["pk"]] for pk in sibling_pks]
+        moved.update(sibling_pks[index] for index in _get_reordered(positions))
+
+    diff = []
+    for new_item in new_items:
+        old_item = matches.get(new_item["pk"])
+        if old_item is None:
+            diff.append(MenuItemDiff(new=new_item))
+            continue
+        changed_fields = [field for field in DIFF_FIELDS if old_item[field] != new_item[field]]
+        diff.append(MenuItemDiff(old_item, new_item, new_item["pk"] in moved, changed_fields))
+    diff.extend(
+        MenuItemDiff(old=old_item) for old_item in old_items if old_item["pk"] not in new_pk_by_old_pk
+    )
+    return diff
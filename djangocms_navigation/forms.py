@@ -1,7 +1,5 @@
 from django import forms
 from django.contrib.sites.models import Site
-from django.utils.html import escape
-from django.utils.safestring import mark_safe
 from django.utils.translation import gettext_lazy as _
 
 from cms.utils.i18n import get_language_tuple
@@ -9,9 +7,12 @@ from cms.utils.urlutils import admin_reverse
 
 from treebeard.forms import MoveNodeForm, _get_exclude_for_model
 
-from .constants import SELECT2_CONTENT_OBJECT_URL_NAME
+from .constants import (
+    SEARCH_CONTENT_OBJECT_URL_NAME,
+    SELECT2_CONTENT_OBJECT_URL_NAME,
+)
 from .models import MenuContent, MenuItem, NavigationPlugin
-from .utils import supported_content_type_pks
+from .utils import reverse_admin_name, supported_content_type_pks
 
 
 class NavigationPluginForm(forms.ModelForm):
@@ -47,14 +48,39 @@ class ContentTypeObjectSelectWidget(Select2Mixin, forms.TextInput):
     def get_url(self):
         return admin_reverse(SELECT2_CONTENT_OBJECT_URL_NAME)
 
+    def get_search_url(self):
+        """Endpoint searching every content type, used until a content type is selected"""
+        return admin_reverse(SEARCH_CONTENT_OBJECT_URL_NAME)
+
     def build_attrs(self, *args, **kwargs):
         attrs = super().build_attrs(*args, **kwargs)
         attrs.setdefault("data-select2-url", self.get_url())
+        attrs.setdefault("data-search-url", self.get_search_url())
         return attrs
 
 
+class RelativeMenuItemSelectWidget(Select2Mixin, forms.TextInput):
+    """
+    Renders only the selected menu item, the remaining items of the menu
+    are fetched on demand from the menu scoped select2 endpoint.
+    """
+    class Media:
+        js = ("djangocms_navigation/js/relative_node_select.js",)
+
+    def get_url(self, menu_content):
+        return reverse_admin_name(MenuItem, "select2", args=[menu_content.pk])
+
+
 class MenuItemForm(MoveNodeForm):
 
+    _ref_node_id = forms.CharField(
+        label=_("Relative to"),
+        widget=RelativeMenuItemSelectWidget(
+            attrs={"data-placeholder": _("Select menu item")}
+        ),
+        required=False,
+    )
+
     object_id = forms.CharField(
         label=_("Content Object"),
         widget=ContentTypeObjectSelectWidget(
@@ -75,9 +101,10 @@ class MenuItemForm(MoveNodeForm):
             "content_type"
         ].queryset.filter(pk__in=supported_content_type_pks(self._meta.model))
 
-        self.fields["_ref_node_id"].choices = self.mk_dropdown_tree(
-            self._meta.model, for_node=self.menu_root.get_root()
-        )
+        menu_content = getattr(self.menu_root, "menucontent", None)
+        if menu_content:
+            ref_node_widget = self.fields["_ref_node_id"].widget
+            ref_node_widget.attrs["data-select2-url"] = ref_node_widget.get_url(menu_content)
 
     def clean(self):
         cleaned_data = super().clean()
@@ -95,9 +122,16 @@ class MenuItemForm(MoveNodeForm):
 
         try:
             node = self._meta.model.objects.get(id=_ref_node_id)
-        except self._meta.model.DoesNotExist:
+        except (self._meta.model.DoesNotExist, ValueError):
             node = None
 
+        # The relative menu item is no longer limited by a choice list, so make
+        # sure it belongs to the menu being edited
+        if node and not node.path.startswith(self.menu_root.path):
+            raise forms.ValidationError(
+                {"_ref_node_id": [_("The relative menu item must belong to this menu")]}
+            )
+
         # Check we're not trying to modify the root node cause some
         # validation will not apply
         changing_root = self.instance.pk and self.instance.is_root()
@@ -131,11 +165,8 @@ class MenuItemForm(MoveNodeForm):
 
     @classmethod
     def mk_dropdown_tree(cls, model, for_node=None):
-        """ Creates a tree-like list of choices for root node """
-        options = [(0, _("-- root --"))]
-        if for_node:
-            for node in model.get_tree(for_node):
-                options.append(
-                    (node.pk, mark_safe(cls.mk_indent(node.get_depth()) + escape(node)))
-                )
-        return options
+        """
+        The relative menu item is picked through the select2 endpoint,
+        so avoid loading the whole tree when the form is initialised.
+        """
+        return [(0, _("-- root --"))]
@@ -0,0 +1,170 @@
+from collections import defaultdict
+
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.sites.models import Site
+from django.db import transaction
+from django.test import RequestFactory
+
+from cms.models import Page
+from cms.operations import CHANGE_PAGE, MOVE_PAGE
+from menus.menu_pool import menu_pool
+
+from djangocms_versioning.constants import (
+    OPERATION_ARCHIVE,
+    OPERATION_PUBLISH,
+    OPERATION_UNPUBLISH,
+)
+
+from .cache import invalidate_select2_cache
+from .conf import NODE_CACHE_TTL
+from .helpers import get_menu_contents_for_content_objects, refresh_stored_urls
+from .models import MenuContent, MenuItemUrl
+from .utils import (
+    get_versionable_for_content,
+    purge_menu_cache,
+    supported_models,
+)
+
+
+def invalidate_select2_cache_on_version_operation(sender, **kwargs):
+    """
+    Publishing, unpublishing or archiving a version changes which objects the content object select2
+    endpoint lists, for the content model and for its grouper (e.g. PageContent and Page)
+    """
+    versionable = get_versionable_for_content(sender)
+    if versionable is None:
+        return
+    content_types = ContentType.objects.get_for_models(versionable.content_model, versionable.grouper_model)
+    for content_type in content_types.values():
+        invalidate_select2_cache(content_type.pk)
+
+
+def refresh_menu_item_urls(model, object_ids):
+    """Resolves again the stored URLs of the menu items linked to the objects of model with a pk in object_ids"""
+    refresh_stored_urls(MenuItemUrl.objects.filter(
+        menu_item__content_type=ContentType.objects.get_for_model(model), menu_item__object_id__in=object_ids
+    ))
+
+
+def get_page_subtree_ids(page):
+    """The pks of page and of its descendants"""
+    descendants = Page._base_manager.filter(node__path__startswith=page.node.path).values_list("pk", flat=True)
+    return {page.pk, *descendants}
+
+
+def refresh_menu_item_urls_on_version_operation(sender, obj, **kwargs):
+    """The URL of the grouper of a content can depend on its published version"""
+    versionable = get_versionable_for_content(sender)
+    if versionable is None or versionable.grouper_model not in supported_models(MenuContent):
+        return
+    grouper = getattr(obj.content, versionable.grouper_field.attname)
+    refresh_menu_item_urls(versionable.grouper_model, [grouper])
+
+
+def refresh_menu_item_urls_on_page_operation(sender, **kwargs):
+    """
+    Changing the slug of a page or moving it also changes the URL of its descendants,
+    which django CMS updates without saving them one by one
+    """
+    page = kwargs.get("obj")
+    if kwargs.get("operation") in (MOVE_PAGE, CHANGE_PAGE) and isinstance(page, Page):
+        page_ids = get_page_subtree_ids(page)
+        refresh_menu_item_urls(Page, page_ids)
+        purge_menu_cache_for_content_objects([Page(pk=pk) for pk in page_ids])
+
+
+def refresh_menu_item_urls_on_content_change(sender, instance, **kwargs):
+    """Connected to the saves and deletes of every model registered in navigation_models"""
+    refresh_menu_item_urls(sender, [instance.pk])
+    purge_menu_cache_for_content_objects([instance])
+
+
+def refresh_menu_item_urls_on_menu_item_save(sender, instance, created, **kwargs):
+    """The content linked to the menu item may have changed"""
+    if not created:
+        refresh_stored_urls(MenuItemUrl.objects.filter(menu_item=instance))
+
+
+def cache_navigation_nodes(site_id, languages):
+    """Builds and caches the live navigation nodes of a site in languages, as an anonymous visitor"""
+    # cms_menus registers the menus of the app when imported
+    from .cms_menus import CMSMenu
+
+    request = RequestFactory().get("/")
+    request.user = AnonymousUser()
+    menu = CMSMenu(menu_pool.get_renderer(request))
+    menu.cache_nodes_for_languages(request, Site.objects.get(pk=site_id), languages)
+
+
+class MenuCachePurge:
+    """
+    An on_commit callback purging and rebuilding once the menu cache of the site languages
+    collected during a transaction
+    """
+
+    def __init__(self, site_languages):
+        self.site_languages = set(site_languages)
+        self.done = False
+
+    def __call__(self):
+        self.done = True
+        languages_by_site = defaultdict(list)
+        for site_id, language in sorted(self.site_languages):
+            purge_menu_cache(site_id=site_id, language=language)
+            languages_by_site[site_id].append(language)
+        if NODE_CACHE_TTL:
+            for site_id, languages in languages_by_site.items():
+                cache_navigation_nodes(site_id, languages)
+
+
+def schedule_menu_cache_purge(site_languages):
+    """
+    Purges the menu cache of the (site id, language) pairs of site_languages once the current
+    transaction is committed, together with the pairs collected earlier in the transaction
+    """
+    connection = transaction.get_connection()
+    pending = getattr(connection, "navigation_menu_cache_purge", None)
+    # A rolled back transaction drops its callbacks without calling them
+    if pending is not None and not pending.done and any(
+        callback is pending for _, callback, *_ in connection.run_on_commit
+    ):
+        pending.site_languages.update(site_languages)
+        return
+    connection.navigation_menu_cache_purge = MenuCachePurge(site_languages)
+    transaction.on_commit(connection.navigation_menu_cache_purge)
+
+
+def purge_menu_cache_for_content_objects(content_objects, language=None):
+    """
+    Clears the menu cache of the sites and languages of the menus, of any version, linking to
+    one of content_objects, and caches their navigation nodes again. The cache of the other
+    sites and languages is kept. This happens once the current transaction is committed, so
+    that the nodes aren't built from uncommitted rows.
+    """
+    menu_contents = get_menu_contents_for_content_objects(content_objects, queryset=MenuContent._base_manager.all())
+    if language is not None:
+        menu_contents = menu_contents.filter(language=language)
+    site_languages = set(menu_contents.values_list("menu__site_id", "language").distinct())
+    if site_languages:
+        schedule_menu_cache_purge(site_languages)
+
+
+def purge_menu_cache_on_version_operation(sender, operation, obj, **kwargs):
+    """
+    Publishing, unpublishing or archiving the content of an object linked from menus changes
+    the nodes of these menus. The menus themselves are handled by the MenuContent versioning hooks.
+    """
+    if operation not in (OPERATION_PUBLISH, OPERATION_UNPUBLISH, OPERATION_ARCHIVE) or sender is MenuContent:
+        return
+    versionable = get_versionable_for_content(sender)
+    if versionable is None or versionable.grouper_model not in supported_models(MenuContent):
+        return
+    grouper = versionable.grouper_model(pk=getattr(obj.content, versionable.grouper_field.attname))
+    purge_menu_cache_for_content_objects([grouper], language=getattr(obj.content, "language", None))
+
+
+def on_page_url_change(sender, instance, **kwargs):
+    """A new slug or path of a page changes its URL in the menus linking to it, in the language of the PageUrl"""
+    refresh_menu_item_urls(Page, [instance.page_id])
+    purge_menu_cache_for_content_objects([Page(pk=instance.page_id)], language=instance.language)
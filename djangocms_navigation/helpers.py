@@ -1,10 +1,14 @@
-from copy import deepcopy
+from collections import defaultdict
+from copy import copy
 
 from django.contrib.contenttypes.models import ContentType
+from django.db.models import Q, prefetch_related_objects
+from django.utils.translation import override
 
 from djangocms_versioning import versionables
 
-from .models import MenuItem
+from .conf import MENU_ITEM_URL_CACHE
+from .models import MenuContent, MenuItem, MenuItemUrl
 
 
 def get_navigation_node_for_content_object(menu_content, content_object, node_model=MenuItem):
@@ -17,27 +21,153 @@ def get_navigation_node_for_content_object(menu_content, content_object, node_mo
     :return: A navigation node or False
     """
 
-    root = node_model.get_root_nodes().filter(menucontent=menu_content).first()
-    if root:
-        content_object_content_type = ContentType.objects.get_for_model(content_object)
-        child_nodes = root.get_descendants()
-        search_node = child_nodes.filter(content_type=content_object_content_type, object_id=content_object.pk).first()
-        if search_node:
-            return search_node
+    search_node = node_model.objects.filter(
+        menu_root=menu_content.root_id,
+        depth__gt=1,
+        content_type=ContentType.objects.get_for_model(content_object),
+        object_id=content_object.pk,
+    ).order_by("path").first()
+    if search_node:
+        return search_node
 
     return False
 
 
+def _get_request_node_cache(request, menu_content):
+    """The navigation nodes already found for menu_content during the request, by (content type, object id)"""
+    if request is None:
+        return {}
+    if not hasattr(request, "_navigation_node_cache"):
+        request._navigation_node_cache = {}
+    return request._navigation_node_cache.setdefault(menu_content.root_id, {})
+
+
+def get_navigation_nodes_for_content_objects(menu_content, content_objects, node_model=MenuItem, request=None):
+    """
+    Find the navigation nodes containing content_objects in a Navigation menu, in a single query
+
+    :param menu_content: A MenuContent instance
+    :param content_objects: An iterable of content objects registered in the cms_config
+    :param node_model: A model used for a navigation item
+    :param request: A request object, the nodes found are cached on it for the following calls
+    :return: A dict of the first navigation node of each content object found in the menu
+    """
+    content_objects = list(content_objects)
+    content_types = ContentType.objects.get_for_models(*{obj.__class__ for obj in content_objects})
+    keys = {obj: (content_types[obj.__class__].pk, obj.pk) for obj in content_objects}
+    cache = _get_request_node_cache(request, menu_content)
+
+    object_ids = defaultdict(set)
+    for content_type_id, object_id in keys.values():
+        if (content_type_id, object_id) not in cache:
+            object_ids[content_type_id].add(object_id)
+    if object_ids:
+        query = Q()
+        for content_type_id, pks in object_ids.items():
+            query |= Q(content_type_id=content_type_id, object_id__in=pks)
+        nodes = node_model.objects.filter(query, menu_root=menu_content.root_id, depth__gt=1).order_by("path")
+        found = {}
+        for node in nodes:
+            found.setdefault((node.content_type_id, node.object_id), node)
+        for content_type_id, pks in object_ids.items():
+            for object_id in pks:
+                cache[(content_type_id, object_id)] = found.get((content_type_id, object_id))
+
+    return {obj: cache[key] for obj, key in keys.items() if cache[key] is not None}
+
+
+def get_menu_contents_for_content_objects(content_objects, queryset=None, node_model=MenuItem):
+    """
+    Find the menus containing a navigation node for any of the content_objects, in one query
+
+    :param content_objects: An iterable of content objects registered in the cms_config
+    :param queryset: The MenuContent queryset to filter, MenuContent.objects by default, which
+        only lists the published menus when versioning is enabled
+    :param node_model: A model used for a navigation item
+    :return: A MenuContent queryset
+    """
+    if queryset is None:
+        queryset = MenuContent.objects.all()
+    object_ids = defaultdict(set)
+    for content_object in content_objects:
+        object_ids[content_object.__class__].add(content_object.pk)
+    if not object_ids:
+        return queryset.none()
+
+    content_types = ContentType.objects.get_for_models(*object_ids)
+    query = Q()
+    for model, pks in object_ids.items():
+        query |= Q(content_type=content_types[model], object_id__in=pks)
+    return queryset.filter(root__in=node_model._base_manager.filter(query, depth__gt=1).values("menu_root"))
+
+
+def get_menu_contents_for_content_object(content_object, queryset=None, node_model=MenuItem):
+    """
+    Find the menus containing a navigation node for content_object
+
+    :param content_object: A content object registered in the cms_config
+    :return: A MenuContent queryset
+    """
+    return get_menu_contents_for_content_objects([content_object], queryset, node_model)
+
+
+def store_menu_item_urls(menu_items, languages):
+    """
+    Resolves and stores the URL of the content of menu_items in each of languages, replacing
+    the URLs already stored. Called when a menu is published and when the URL of the content
+    may have changed, so that building the menu doesn't resolve them.
+
+    :param menu_items: MenuItem instances, roots excluded
+    :param languages: Language codes
+    """
+    if not MENU_ITEM_URL_CACHE:
+        return
+    menu_items = list(menu_items)
+    prefetch_related_objects(menu_items, "content")
+    urls = []
+    for language in languages:
+        with override(language):
+            for item in menu_items:
+                url = item.content.get_absolute_url() if item.content else ""
+                urls.append(MenuItemUrl(menu_item=item, language=language, url=url))
+    MenuItemUrl.objects.filter(menu_item__in=menu_items, language__in=languages).delete()
+    MenuItemUrl.objects.bulk_create(urls, ignore_conflicts=True)
+
+
+def refresh_stored_urls(menu_item_urls):
+    """
+    Resolves again the URLs of a MenuItemUrl queryset, in their language
+
+    :param menu_item_urls: A MenuItemUrl queryset
+    """
+    item_ids_by_language = defaultdict(set)
+    for item_id, language in menu_item_urls.values_list("menu_item_id", "language"):
+        item_ids_by_language[language].add(item_id)
+    item_ids = set().union(*item_ids_by_language.values())
+    menu_items = MenuItem._base_manager.in_bulk(item_ids)
+    for language, language_item_ids in item_ids_by_language.items():
+        store_menu_item_urls([menu_items[pk] for pk in language_item_ids if pk in menu_items], [language])
+
+
 def proxy_model(obj, content_model):
     """
     Get the proxy model from a
 
+    The proxy is a shallow copy: its attributes, model state and cache dicts are copied so
+    that changing them doesn't affect obj, but the cached related and prefetched objects are
+    shared with obj and must be treated as read-only.
+
     :param obj: A registered versionable object
     :param content_model: A registered content model
     """
     versionable = versionables.for_content(content_model)
-    obj_ = deepcopy(obj)
-    obj_.__class__ = versionable.version_model_proxy
+    proxy_class = versionable.version_model_proxy
+    obj_ = proxy_class.__new__(proxy_class)
+    obj_.__dict__.update(obj.__dict__)
+    obj_._state = copy(obj._state)
+    obj_._state.fields_cache = obj._state.fields_cache.copy()
+    if "_prefetched_objects_cache" in obj.__dict__:
+        obj_._prefetched_objects_cache = obj._prefetched_objects_cache.copy()
     return obj_
 
 
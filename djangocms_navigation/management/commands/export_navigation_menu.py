@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from djangocms_navigation.models import MenuContent
+from djangocms_navigation.serialization import (
+    FORMATS,
+    NDJSON,
+    export_menu_content,
+)
+
+
+class Command(BaseCommand):
+    help = "Export the menu items tree of a MenuContent as NDJSON or JSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument("menu_content_id", type=int, help="Id of the MenuContent to export")
+        parser.add_argument(
+            "--format", choices=FORMATS, default=NDJSON, help="Export format, defaults to ndjson"
+        )
+        parser.add_argument("--output", help="File to write the export to, defaults to stdout")
+
+    def handle(self, *args, **options):
+        try:
+            menu_content = MenuContent._base_manager.select_related("menu", "root").get(
+                pk=options["menu_content_id"]
+            )
+        except MenuContent.DoesNotExist:
+            raise CommandError("MenuContent {} does not exist".format(options["menu_content_id"]))
+
+        chunks = export_menu_content(menu_content, format=options["format"])
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as output:
+                output.writelines(chunks)
+        else:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
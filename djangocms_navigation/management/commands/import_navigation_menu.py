@@ -0,0 +1,52 @@
+from django.contrib.auth import get_user_model
+from django.contrib.sites.models import Site
+from django.core.management.base import BaseCommand, CommandError
+
+from djangocms_navigation.serialization import (
+    MenuImportError,
+    import_menu_content,
+)
+
+
+class Command(BaseCommand):
+    help = "Import a menu exported with export_navigation_menu as a new MenuContent draft"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="NDJSON or JSON file to import")
+        parser.add_argument(
+            "--user", required=True, help="Username of the user the draft version is created by"
+        )
+        parser.add_argument("--site", type=int, help="Id of the site to import to, defaults to the exported site")
+        parser.add_argument(
+            "--archive-draft",
+            action="store_true",
+            help="Archive the current draft of the menu language, if the user can modify it, instead of failing",
+        )
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        try:
+            user = User._default_manager.get_by_natural_key(options["user"])
+        except User.DoesNotExist:
+            raise CommandError("User {} does not exist".format(options["user"]))
+
+        site = None
+        if options["site"]:
+            try:
+                site = Site.objects.get(pk=options["site"])
+            except Site.DoesNotExist:
+                raise CommandError("Site {} does not exist".format(options["site"]))
+
+        try:
+            with open(options["path"], encoding="utf-8") as lines:
+                menu_content = import_menu_content(
+                    lines, user, site=site, archive_draft=options["archive_draft"]
+                )
+        except (OSError, MenuImportError, ValueError) as error:
+            raise CommandError(str(error))
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Imported menu {} as MenuContent {}".format(menu_content.menu.identifier, menu_content.pk)
+            )
+        )
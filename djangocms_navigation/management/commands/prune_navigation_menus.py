@@ -0,0 +1,96 @@
+from datetime import timedelta
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models.deletion import ProtectedError
+from django.utils import timezone
+
+from djangocms_versioning.constants import ARCHIVED
+from djangocms_versioning.models import Version
+
+from djangocms_navigation.conf import ARCHIVED_MENU_RETENTION_DAYS
+from djangocms_navigation.models import MenuContent, MenuItem
+from djangocms_navigation.tree import delete_menu_tree
+from djangocms_navigation.utils import is_versioning_enabled
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete the archived menu versions older than the retention period with their menu item trees, "
+        "and the menu item trees that don't belong to any menu"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=ARCHIVED_MENU_RETENTION_DAYS,
+            help="Archived versions last modified more than this number of days ago are deleted",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=1000, help="Number of menu items deleted per query"
+        )
+        parser.add_argument(
+            "--dry-run", action="store_true", help="Only report what would be deleted"
+        )
+
+    def get_archived_versions(self, days):
+        return Version.objects.filter(
+            content_type=ContentType.objects.get_for_model(MenuContent),
+            state=ARCHIVED,
+            modified__lt=timezone.now() - timedelta(days=days),
+        ).order_by("pk")
+
+    def get_orphaned_roots(self):
+        return MenuItem._base_manager.filter(depth=1, menucontent__isnull=True).order_by("path")
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+        pruned_trees = pruned_items = 0
+
+        if is_versioning_enabled(MenuContent):
+            versions = self.get_archived_versions(options["days"])
+            self.stdout.write("Found {} archived menu versions to delete".format(versions.count()))
+            for version in versions.iterator():
+                menu_content = MenuContent._base_manager.select_related("root").filter(pk=version.object_id).first()
+                if menu_content is None:
+                    self.stderr.write("Skipped version {}, its menu content no longer exists".format(version.pk))
+                    continue
+                root = menu_content.root
+                if not dry_run:
+                    try:
+                        with transaction.atomic():
+                            version.delete()
+                            menu_content.delete()
+                    except ProtectedError:
+                        self.stderr.write("Skipped version {}, it is still referenced".format(version.pk))
+                        continue
+                pruned_items += self.delete_tree(root, options["batch_size"], dry_run)
+                pruned_trees += 1
+
+        roots = self.get_orphaned_roots()
+        self.stdout.write("Found {} menu item trees without a menu".format(roots.count()))
+        for root in roots.iterator():
+            pruned_items += self.delete_tree(root, options["batch_size"], dry_run)
+            pruned_trees += 1
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                "{} {} menu items of {} menu trees".format(
+                    "Would delete" if dry_run else "Deleted", pruned_items, pruned_trees
+                )
+            )
+        )
+
+    def delete_tree(self, root, batch_size, dry_run):
+        if dry_run:
+            count = MenuItem._base_manager.filter(menu_root=root).count()
+            self.stdout.write("Would delete menu item tree {} ({} items)".format(root.pk, count))
+            return count
+
+        deleted = 0
+        for count in delete_menu_tree(root, batch_size):
+            deleted += count
+            self.stdout.write("Deleted {} items of menu item tree {}".format(deleted, root.pk))
+        return deleted
@@ -0,0 +1,102 @@
+import multiprocessing
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.sites.models import Site
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import RequestFactory
+
+from cms.utils.i18n import get_language_list
+from menus.menu_pool import menu_pool
+
+from djangocms_navigation.cms_menus import CMSMenu
+from djangocms_navigation.conf import NODE_CACHE_TTL
+
+
+# Cache backends whose content only lives in the process storing it
+PROCESS_LOCAL_CACHES = (LocMemCache, DummyCache)
+
+
+def count_menu_nodes(nodes):
+    """:return: A Counter of the menu items of each menu, by menu root identifier"""
+    menu_by_node = {}
+    counts = Counter()
+    for node in nodes:
+        if node.parent_id is None:
+            menu_by_node[node.id] = node.id
+            counts[node.id] = 0
+        else:
+            menu_by_node[node.id] = menu_by_node[node.parent_id]
+            counts[menu_by_node[node.id]] += 1
+    return counts
+
+
+def warm_site(site_id, languages):
+    """
+    Builds and caches the navigation nodes of a site in all its languages
+
+    :return: The build duration and a dict of the menu item count of each menu of each language
+    """
+    site = Site.objects.get(pk=site_id)
+    request = RequestFactory().get("/")
+    request.user = AnonymousUser()
+    menu = CMSMenu(menu_pool.get_renderer(request))
+    start = time.perf_counter()
+    nodes = menu.cache_nodes_for_languages(request, site, languages)
+    duration = time.perf_counter() - start
+    return duration, {language: count_menu_nodes(language_nodes) for language, language_nodes in nodes.items()}
+
+
+class Command(BaseCommand):
+    help = "Build and cache the navigation nodes of every site and language"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--site", type=int, action="append", help="Id of a site to warm, defaults to all sites")
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=1,
+            help="Number of processes warming sites in parallel, requires a cache shared between processes",
+        )
+
+    def handle(self, *args, **options):
+        if not NODE_CACHE_TTL:
+            raise CommandError("The navigation node cache is disabled by DJANGOCMS_NAVIGATION_NODE_CACHE_TTL")
+        backend = caches[DEFAULT_CACHE_ALIAS]
+        if options["processes"] > 1 and isinstance(backend, PROCESS_LOCAL_CACHES):
+            raise CommandError(
+                "The {} cache backend isn't shared between processes, the nodes warmed by --processes would be "
+                "lost".format(backend.__class__.__name__)
+            )
+
+        sites = Site.objects.order_by("pk")
+        if options["site"]:
+            sites = sites.filter(pk__in=options["site"])
+        jobs = [(site.pk, site.domain, get_language_list(site.pk)) for site in sites]
+
+        start = time.perf_counter()
+        if options["processes"] > 1:
+            # The forked processes open their own database connections
+            connections.close_all()
+            with ProcessPoolExecutor(
+                max_workers=options["processes"], mp_context=multiprocessing.get_context("fork")
+            ) as executor:
+                results = list(
+                    executor.map(warm_site, [job[0] for job in jobs], [job[2] for job in jobs])
+                )
+        else:
+            results = [warm_site(site_id, languages) for site_id, _, languages in jobs]
+
+        total = time.perf_counter() - start
+        for (site_id, domain, languages), (duration, counts) in zip(jobs, results):
+            self.stdout.write("Site {} ({}): {:.3f}s".format(domain, site_id, duration))
+            for language in languages:
+                for identifier, count in counts[language].items():
+                    self.stdout.write("  {} {}: {} menu items".format(language, identifier, count))
+        self.stdout.write(self.style.SUCCESS("Warmed {} sites in {:.3f}s".format(len(jobs), total)))
@@ -0,0 +1,24 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('djangocms_navigation', '0014_menu_main_navigation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MenuItemUrl',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('language', models.CharField(max_length=15, verbose_name='language')),
+                ('url', models.CharField(blank=True, max_length=2048)),
+                ('menu_item', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='urls', to='djangocms_navigation.menuitem')),
+            ],
+            options={
+                'unique_together': {('menu_item', 'language')},
+            },
+        ),
+    ]
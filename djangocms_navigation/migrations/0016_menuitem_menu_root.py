@@ -0,0 +1,25 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def populate_menu_root(apps, schema_editor):
+    db_alias = schema_editor.connection.alias
+    MenuItem = apps.get_model("djangocms_navigation", "MenuItem")
+    for root in MenuItem.objects.using(db_alias).filter(depth=1).only("pk", "path").iterator():
+        MenuItem.objects.using(db_alias).filter(path__startswith=root.path).update(menu_root=root.pk)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('djangocms_navigation', '0015_menuitemurl'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='menuitem',
+            name='menu_root',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='djangocms_navigation.menuitem'),
+        ),
+        migrations.RunPython(populate_menu_root, migrations.RunPython.noop),
+    ]
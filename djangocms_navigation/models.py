@@ -59,10 +59,41 @@ class AbstractMenuItem(MP_Node):
     soft_root = models.BooleanField(_("soft root"), db_index=True, default=False,
                                     help_text=_("All ancestors will not be displayed in the navigation"))
     hide_node = models.BooleanField(_("Hide in menu"), default=False, db_index=True)
+    # The root of the tree of the item, denormalised from the path so that the items of a menu
+    # can be selected with an indexed integer rather than a path prefix
+    menu_root = models.ForeignKey(
+        "self", related_name="+", on_delete=models.CASCADE, null=True, blank=True, editable=False
+    )
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        if self.menu_root_id is None and self.depth and self.depth > 1:
+            self.menu_root_id = (
+                self.__class__._base_manager.filter(path=self.path[:self.steplen]).values_list("pk", flat=True).first()
+            )
+        super().save(*args, **kwargs)
+        if self.menu_root_id is None and self.depth == 1:
+            self.menu_root_id = self.pk
+            self.__class__._base_manager.filter(pk=self.pk).update(menu_root=self.pk)
+
+    def _set_menu_root(self, kwargs):
+        """Passes the menu root of this item to a new item created in the same tree"""
+        if "instance" in kwargs:
+            kwargs["instance"].menu_root_id = self.menu_root_id
+        else:
+            kwargs.setdefault("menu_root_id", self.menu_root_id)
+        return kwargs
+
+    def add_child(self, **kwargs):
+        return super().add_child(**self._set_menu_root(kwargs))
+
+    def add_sibling(self, pos=None, **kwargs):
+        if self.depth > 1:
+            kwargs = self._set_menu_root(kwargs)
+        return super().add_sibling(pos, **kwargs)
+
     class Meta:
         abstract = True
 
@@ -94,7 +125,25 @@ class MenuContent(AbstractMenuContent):
 
 
 class MenuItem(AbstractMenuItem):
-    pass
+    class Meta:
+        indexes = [
+            # Finds the menu items, and so the menus, linking to a content object
+            models.Index(fields=["content_type", "object_id"], name="navigation_item_content_idx"),
+        ]
+
+
+class MenuItemUrl(models.Model):
+    """
+    The URL of the content of a menu item in a language, stored when the menu is published so
+    that building the menu doesn't resolve it. Rows are resolved again when the URL of the
+    content may have changed.
+    """
+    menu_item = models.ForeignKey(MenuItem, on_delete=models.CASCADE, related_name="urls")
+    language = models.CharField(_("language"), max_length=15)
+    url = models.CharField(max_length=2048, blank=True)
+
+    class Meta:
+        unique_together = ("menu_item", "language")
 
 
 class NavigationPlugin(CMSPlugin):
@@ -0,0 +1,63 @@
+from abc import ABC, abstractmethod
+
+from django.db.models import Q
+from django.utils.module_loading import import_string
+
+from djangocms_navigation.conf import SEARCH_BACKEND
+
+
+class BaseSearchBackend(ABC):
+    """
+    Searches the objects of a model registered in navigation_models for the
+    content object select2 endpoint.
+    """
+    # Whether every result of a query is also a result of its prefixes, which
+    # allows narrowing a query to the cached results of a shorter one
+    narrows_prefixes = False
+
+    @abstractmethod
+    def search(self, queryset, query, search_fields):
+        """
+        :param queryset: The queryset of objects that can be linked to a menu item
+        :param query: The search term typed in the select2 widget
+        :param search_fields: The lookups configured in navigation_models for the model
+        :return: The objects of queryset matching the query
+        """
+
+
+class SubquerySearchBackend(BaseSearchBackend):
+    """
+    Matches the query against every search field. Each lookup is resolved into a
+    subquery of matching pks, so lookups across related tables don't multiply the
+    rows of the queryset and no distinct is needed.
+    """
+    narrows_prefixes = True
+
+    def get_lookup(self, field):
+        return field
+
+    def search(self, queryset, query, search_fields):
+        manager = queryset.model._base_manager
+        condition = Q()
+        for field in search_fields:
+            condition |= Q(pk__in=manager.filter(**{self.get_lookup(field): query}).values("pk"))
+        return queryset.filter(condition)
+
+
+class PostgresTrigramSearchBackend(SubquerySearchBackend):
+    """
+    Replaces the icontains lookups by trigram word similarity lookups, which can use
+    GIN trigram indexes. Requires Django 4.0 or later, django.contrib.postgres in
+    INSTALLED_APPS and the pg_trgm extension.
+    """
+    narrows_prefixes = False
+
+    def get_lookup(self, field):
+        if field.endswith("__icontains"):
+            return field[:-len("icontains")] + "trigram_word_similar"
+        return field
+
+
+def get_search_backend():
+    """Returns an instance of the backend configured with DJANGOCMS_NAVIGATION_SEARCH_BACKEND"""
+    return import_string(SEARCH_BACKEND)()
@@ -0,0 +1,221 @@
+import json
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+from djangocms_versioning.constants import DRAFT
+from djangocms_versioning.exceptions import ConditionFailed
+from djangocms_versioning.models import Version
+
+from .models import Menu, MenuContent, MenuItem
+from .tree import get_copy_plan
+from .utils import get_versionable_for_content, is_versioning_enabled
+
+
+try:
+    from djangocms_version_locking.helpers import content_is_unlocked_for_user
+
+    using_version_lock = True
+except ImportError:
+    using_version_lock = False
+
+
+NDJSON = "ndjson"
+JSON = "json"
+FORMATS = (NDJSON, JSON)
+
+# Fields maintained by treebeard, they are recomputed on import
+TREE_FIELDS = ("path", "depth", "numchild", "menu_root")
+
+BULK_CREATE_BATCH_SIZE = 1000
+
+
+class MenuImportError(ValueError):
+    pass
+
+
+def _get_item_fields(model):
+    return get_copy_plan(model, exclude=TREE_FIELDS)
+
+
+def _serialize_item(item, parent_id, fields):
+    record = {"id": item.pk, "parent": parent_id}
+    for field in fields:
+        if field.name == "content_type":
+            content_type = ContentType.objects.get_for_id(item.content_type_id) if item.content_type_id else None
+            record["content_type"] = ".".join(content_type.natural_key()) if content_type else None
+        else:
+            record[field.attname] = field.value_from_object(item)
+    return record
+
+
+def iter_menu_content_records(menu_content, item_model=MenuItem):
+    """
+    Yields the records describing a MenuContent, the menu first, followed by its items in tree order.
+    Items are read with a server side cursor, so the tree is never loaded in memory at once.
+    """
+    menu = menu_content.menu
+    yield {
+        "identifier": menu.identifier,
+        "site": menu.site_id,
+        "language": menu_content.language,
+    }
+    fields = _get_item_fields(item_model)
+    items = item_model._base_manager.filter(menu_root=menu_content.root_id).order_by("path")
+    pk_by_path = {}
+    for item in items.iterator():
+        parent_id = pk_by_path.get(item_model._get_parent_path_from_path(item.path))
+        pk_by_path[item.path] = item.pk
+        yield _serialize_item(item, parent_id, fields)
+
+
+def export_menu_content(menu_content, format=NDJSON):
+    """
+    Streams a MenuContent tree as text chunks. The NDJSON format has the menu on the first line
+    and one menu item per line, the JSON format has a {"menu": {}, "items": []} document.
+    """
+    records = iter_menu_content_records(menu_content)
+    menu = next(records)
+    if format == NDJSON:
+        yield json.dumps(menu, cls=DjangoJSONEncoder) + "\n"
+        for record in records:
+            yield json.dumps(record, cls=DjangoJSONEncoder) + "\n"
+    elif format == JSON:
+        yield '{"menu": %s, "items": [' % json.dumps(menu, cls=DjangoJSONEncoder)
+        separator = "\n"
+        for record in records:
+            yield separator + json.dumps(record, cls=DjangoJSONEncoder)
+            separator = ",\n"
+        yield "\n]}\n"
+    else:
+        raise ValueError("Unknown export format: {}".format(format))
+
+
+def read_menu_content_records(lines):
+    """
+    Reads records written by export_menu_content in either format. NDJSON input is parsed line by line.
+    """
+    lines = iter(lines)
+    first_line = next(lines, "")
+    if isinstance(first_line, bytes):
+        lines = (line.decode("utf-8") for line in lines)
+        first_line = first_line.decode("utf-8")
+    try:
+        first = json.loads(first_line)
+    except ValueError:
+        # A JSON document spread across several lines
+        document = json.loads(first_line + "".join(lines))
+        yield document["menu"]
+        yield from document["items"]
+        return
+    if "menu" in first and "items" in first:
+        yield first["menu"]
+        yield from first["items"]
+        return
+    yield first
+    for line in lines:
+        if line.strip():
+            yield json.loads(line)
+
+
+def _deserialize_item(record, fields):
+    values = {}
+    for field in fields:
+        if field.name == "content_type":
+            natural_key = record.get("content_type")
+            try:
+                values["content_type"] = (
+                    ContentType.objects.get_by_natural_key(*natural_key.split(".")) if natural_key else None
+                )
+            except (ContentType.DoesNotExist, TypeError):
+                raise MenuImportError("Unknown content type: {}".format(natural_key))
+        elif field.attname in record:
+            values[field.attname] = record[field.attname]
+    return values
+
+
+def import_menu_content(lines, user, site=None, item_model=MenuItem, archive_draft=False):
+    """
+    Creates a new MenuContent, under a new draft version if versioning is enabled, from records
+    produced by export_menu_content. The item paths are computed while reading and all items
+    below the root are inserted with a single bulk_create, as copy_menu_content does for copies.
+
+    :param lines: An iterable of lines of an export
+    :param user: The user the draft version is created by
+    :param site: The site to import the menu to, defaults to the exported site
+    :param archive_draft: Archive the current draft of the menu language instead of refusing the import
+    :return: The new MenuContent
+    """
+    records = read_menu_content_records(lines)
+    try:
+        menu_record = next(records)
+        root_record = next(records)
+    except StopIteration:
+        raise MenuImportError("The export does not contain a menu")
+    if root_record.get("parent") is not None:
+        raise MenuImportError("The first menu item of the export must be the menu root")
+
+    fields = _get_item_fields(item_model)
+    with transaction.atomic():
+        menu = Menu.objects.get_or_create(
+            identifier=menu_record["identifier"],
+            site_id=site.pk if site else menu_record["site"],
+        )[0]
+        language = menu_record["language"]
+        if is_versioning_enabled(MenuContent):
+            _archive_existing_draft(menu, language, user, archive_draft)
+
+        root = item_model.add_root(**_deserialize_item(root_record, fields))
+        nodes = {root_record["id"]: root}
+        to_create = []
+        for record in records:
+            try:
+                parent = nodes[record["parent"]]
+            except KeyError:
+                raise MenuImportError(
+                    "Menu item {} is listed before its parent {}".format(record.get("id"), record.get("parent"))
+                )
+            parent.numchild += 1
+            item = item_model(
+                path=item_model._get_path(parent.path, parent.depth + 1, parent.numchild),
+                depth=parent.depth + 1,
+                numchild=0,
+                menu_root_id=root.pk,
+                **_deserialize_item(record, fields)
+            )
+            nodes[record["id"]] = item
+            to_create.append(item)
+        item_model._base_manager.filter(pk=root.pk).update(numchild=root.numchild)
+        item_model._base_manager.bulk_create(to_create, batch_size=BULK_CREATE_BATCH_SIZE)
+
+        menu_content = MenuContent.objects.create(menu=menu, root=root, language=language)
+        if is_versioning_enabled(MenuContent):
+            Version.objects.create(content=menu_content, created_by=user, state=DRAFT)
+    return menu_content
+
+
+def _archive_existing_draft(menu, language, user, archive_draft):
+    """
+    Only one draft can exist per menu and language. The current one may hold the changes of another
+    editor, so it is only archived when archive_draft is set and the user can modify and archive it.
+    """
+    versionable = get_versionable_for_content(MenuContent)
+    drafts = Version.objects.filter_by_grouping_values(
+        versionable, menu=menu, language=language
+    ).filter(state=DRAFT)
+    for draft in drafts:
+        if not archive_draft:
+            raise MenuImportError(
+                "Menu {} already has a draft in {}, archive it before importing".format(menu.identifier, language)
+            )
+        if using_version_lock and not content_is_unlocked_for_user(draft.content, user):
+            raise MenuImportError("The draft of menu {} in {} is locked".format(menu.identifier, language))
+        try:
+            draft.check_modify(user)
+            draft.check_archive(user)
+        except ConditionFailed as error:
+            raise MenuImportError(
+                "The draft of menu {} in {} can't be archived: {}".format(menu.identifier, language, error)
+            )
+        draft.archive(user)
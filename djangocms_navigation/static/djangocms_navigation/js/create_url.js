@@ -3,7 +3,10 @@
 
         function initializeContentObjectWidget($element) {
             let endpoint = $element.attr('data-select2-url');
-            let itemsPerPage = 30;
+            // searches every content type until one is selected
+            let searchEndpoint = $element.attr('data-search-url');
+            // pk of the last result of each loaded page, sent back to fetch the next page
+            let lastIds = {};
 
             $element.select2({
                 formatAjaxError: function (jqXHR, textStatus, errorThrown) {
@@ -12,13 +15,18 @@
                 minimumInputLength: 3,
                 responmaximumInputLength: 20,
                 ajax: {
-                    url: endpoint,
+                    url: function() {
+                        if (searchEndpoint && !getContentTypeSelect($element).val()) {
+                            return searchEndpoint;
+                        }
+                        return endpoint;
+                    },
                     dataType: 'json',
                     quietMillis: 250,
                     data: function(term, page) {
                         return {
                             page: page,
-                            limit: itemsPerPage,
+                            after: page > 1 ? lastIds[page - 1] : undefined,
                             site: $(this.context)
                                 .closest('fieldset')
                                 .find('.field-site select')
@@ -31,6 +39,9 @@
                         };
                     },
                     results: function(data, page) {
+                        if (data.results.length) {
+                            lastIds[page] = data.results[data.results.length - 1].id;
+                        }
                         return data;
                     }
                 },
@@ -59,13 +70,30 @@
                 }
             });
         }
+        function getContentTypeSelect($element) {
+            return $element.closest('fieldset').find('.field-content_type select');
+        }
+
+        function onContentObjectSelected(event) {
+            // Results of the search endpoint carry their content type, which is selected with them
+            if (!event.added || !event.added.content_type_id) {
+                return;
+            }
+            let $element = $(this);
+
+            getContentTypeSelect($element).val(event.added.content_type_id);
+            $element.select2('data', { id: event.added.object_id, text: event.added.text });
+        }
+
         $(':not([id*=__prefix__])[id$="object_id"]').each(function(i, element) {
             initializeContentObjectWidget($(element));
+            $(element).on('change', onContentObjectSelected);
         });
         django
             .jQuery(document)
             .on('formset:added', function(event, $row, formsetName) {
                 initializeContentObjectWidget($($row).find('[id$="object_id"]'));
+                $($row).find('[id$="object_id"]').on('change', onContentObjectSelected);
             });
     });
 })(CMS.$);
\ No newline at end of file
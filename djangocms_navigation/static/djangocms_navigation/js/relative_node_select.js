@@ -0,0 +1,50 @@
+(function($) {
+    $(function() {
+
+        function initializeRelativeNodeWidget($element) {
+            let endpoint = $element.attr('data-select2-url');
+
+            $element.select2({
+                allowClear: true,
+                ajax: {
+                    url: endpoint,
+                    dataType: 'json',
+                    quietMillis: 250,
+                    data: function(term, page) {
+                        return {
+                            page: page,
+                            query: term,
+                        };
+                    },
+                    results: function(data, page) {
+                        return data;
+                    }
+                },
+                initSelection: function(element, callback) {
+                    var nodeId = element.val();
+
+                    $.ajax({
+                        url: endpoint,
+                        dataType: 'json',
+                        data: {
+                            pk: nodeId,
+                        }
+                    })
+                        .done(function(data) {
+                            var text = nodeId;
+                            if (data.results.length) {
+                                text = data.results[0].text;
+                            }
+                            callback({ id: nodeId, text: text });
+                        })
+                        .fail(function() {
+                            callback({ id: nodeId, text: nodeId });
+                        });
+                }
+            });
+        }
+        $('[id$="_ref_node_id"][data-select2-url]').each(function(i, element) {
+            initializeRelativeNodeWidget($(element));
+        });
+    });
+})(CMS.$);
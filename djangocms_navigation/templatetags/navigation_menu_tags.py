@@ -1,7 +1,6 @@
 # -*- coding: utf-8 -*-
 from django import template
 
-from cms.models import Page
 from menus.menu_pool import menu_pool
 
 from classytags.arguments import Argument
@@ -55,7 +54,7 @@ class NavigationShowBreadcrumb(InclusionTag):
         # Find home
         home = None
         for node in nodes:
-            if node.content and isinstance(node.content, Page) and node.content.is_home:
+            if node.is_home:
                 home = node
                 break
 
@@ -66,7 +65,7 @@ class NavigationShowBreadcrumb(InclusionTag):
             node = selected
             while node:
                 # Added  to ancestors only if node content is mapped to page/url and visible
-                if node.content and node.visible or not only_visible:
+                if node.object_id is not None and node.visible or not only_visible:
                     ancestors.append(node)
                 node = node.parent
         if not ancestors or (ancestors and ancestors[-1] != home) and home:
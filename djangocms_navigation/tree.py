@@ -0,0 +1,288 @@
+from functools import lru_cache
+
+from django.db import connections, transaction
+from django.utils.translation import gettext_lazy as _
+
+from treebeard.exceptions import (
+    InvalidMoveToDescendant,
+    InvalidPosition,
+    PathOverflow,
+)
+
+
+# Prefix used to park rewritten nodes while a restructure is applied, it is
+# not part of the treebeard alphabet so it never clashes with a real path
+TEMPORARY_PATH_PREFIX = "~"
+
+BULK_CREATE_BATCH_SIZE = 1000
+
+
+class MenuTree:
+    """
+    In memory representation of a single menu tree, used to apply several
+    structural changes and compute the resulting treebeard paths in one pass.
+    """
+
+    def __init__(self, model, nodes):
+        """
+        :param model: The MP_Node model of the tree
+        :param nodes: An iterable of the nodes of the tree ordered by path, root first
+        """
+        self.model = model
+        self.nodes = {}
+        self.parents = {}
+        self.children = {}
+        pk_by_path = {}
+        for node in nodes:
+            parent_path = model._get_parent_path_from_path(node.path)
+            parent_id = pk_by_path.get(parent_path)
+            if not self.nodes:
+                self.root_id = node.pk
+            elif parent_id is None:
+                raise ValueError("Node {} does not belong to the tree".format(node.pk))
+            self.nodes[node.pk] = node
+            self.parents[node.pk] = parent_id
+            self.children[node.pk] = []
+            if parent_id is not None:
+                self.children[parent_id].append(node.pk)
+            pk_by_path[node.path] = node.pk
+
+    def _get_node_id(self, node_id):
+        try:
+            node_id = int(node_id)
+        except (TypeError, ValueError):
+            raise ValueError("Invalid menu item id: {}".format(node_id))
+        if node_id not in self.nodes:
+            raise ValueError("Menu item {} does not belong to this menu".format(node_id))
+        return node_id
+
+    def is_descendant(self, node_id, ancestor_id):
+        parent_id = self.parents[node_id]
+        while parent_id is not None:
+            if parent_id == ancestor_id:
+                return True
+            parent_id = self.parents[parent_id]
+        return False
+
+    def _place(self, node_id, parent_id, position=None, before_id=None):
+        if node_id == self.root_id:
+            raise InvalidPosition(_("The root menu item cannot be moved"))
+        if node_id == parent_id or self.is_descendant(parent_id, node_id):
+            raise InvalidMoveToDescendant(_("Can't move node to a descendant."))
+        self.children[self.parents[node_id]].remove(node_id)
+        siblings = self.children[parent_id]
+        if before_id is not None:
+            position = siblings.index(before_id)
+        if position is None:
+            siblings.append(node_id)
+        else:
+            siblings.insert(position, node_id)
+        self.parents[node_id] = parent_id
+
+    def move(self, node_id, sibling_id, as_child=False):
+        """
+        Moves a node with the same semantics as the treebeard admin move_node endpoint:
+        as the last child of the target, or to the left of the target.
+        """
+        node_id = self._get_node_id(node_id)
+        target_id = self._get_node_id(sibling_id)
+        if as_child:
+            self._place(node_id, target_id)
+        elif target_id == self.root_id:
+            raise InvalidPosition(_("Cannot move a node outside of the root menu node"))
+        elif node_id != target_id:
+            self._place(node_id, self.parents[target_id], before_id=target_id)
+
+    def set_parent(self, node_id, parent_id, position=None):
+        """Places a node under parent_id at the given 0 based position, last if no position is given"""
+        node_id = self._get_node_id(node_id)
+        parent_id = self._get_node_id(parent_id)
+        if position is not None:
+            try:
+                position = int(position)
+            except (TypeError, ValueError):
+                raise ValueError("Invalid position: {}".format(position))
+            if position < 0:
+                raise InvalidPosition(_("Invalid position"))
+        self._place(node_id, parent_id, position)
+
+    def get_paths(self):
+        """
+        Returns a dict mapping every node id to its (path, depth, numchild)
+        for the current structure of the tree.
+        """
+        max_children = len(self.model.alphabet) ** self.model.steplen - 1
+        root = self.nodes[self.root_id]
+        paths = {}
+        stack = [(self.root_id, root.path, root.depth)]
+        while stack:
+            node_id, path, depth = stack.pop()
+            children = self.children[node_id]
+            if len(children) > max_children:
+                raise PathOverflow(_("Path Overflow from: '%s'") % path)
+            paths[node_id] = (path, depth, len(children))
+            for position, child_id in enumerate(children, start=1):
+                child_path = self.model._get_path(path, depth + 1, position)
+                stack.append((child_id, child_path, depth + 1))
+        return paths
+
+
+def get_menu_tree(root, model=None):
+    """Loads the tree below (and including) root in a single query"""
+    model = model or root.__class__
+    nodes = (
+        model._base_manager.filter(menu_root=root)
+        .only("pk", "path", "depth", "numchild")
+        .order_by("path")
+    )
+    return MenuTree(model, nodes)
+
+
+def restructure_menu_tree(root, moves=None, structure=None):
+    """
+    Applies a list of moves and / or a complete new structure to the menu tree below root
+    in a single transaction, only updating the nodes whose position actually changed.
+
+    :param root: The root MenuItem of the menu
+    :param moves: An ordered list of {"node_id", "sibling_id", "as_child"} moves
+    :param structure: An ordered list of {"node_id", "parent_id", "position"} placements
+    :return: The number of menu items that were updated
+    """
+    model = root.__class__
+    with transaction.atomic():
+        tree = get_menu_tree(root, model)
+        for move in moves or []:
+            tree.move(move["node_id"], move["sibling_id"], bool(int(move.get("as_child", 0))))
+        for placement in structure or []:
+            tree.set_parent(placement["node_id"], placement["parent_id"], placement.get("position"))
+
+        changed = []
+        for node_id, (path, depth, numchild) in tree.get_paths().items():
+            node = tree.nodes[node_id]
+            if (node.path, node.depth, node.numchild) != (path, depth, numchild):
+                changed.append((node, path, depth, numchild))
+
+        # Park the changed nodes on temporary paths first so that swapping
+        # positions never violates the unique constraint on path
+        moved = [node for node, path, depth, numchild in changed if node.path != path]
+        for node in moved:
+            node.path = "{}{}".format(TEMPORARY_PATH_PREFIX, node.pk)
+        model._base_manager.bulk_update(moved, ["path"])
+
+        for node, path, depth, numchild in changed:
+            node.path, node.depth, node.numchild = path, depth, numchild
+        model._base_manager.bulk_update(
+            [change[0] for change in changed], ["path", "depth", "numchild"]
+        )
+    return len(changed)
+
+
+@lru_cache(maxsize=None)
+def get_copy_plan(model, exclude=()):
+    """
+    Returns the concrete fields of model copied to a new instance, computed once per model.
+    The pk is never copied and the fields named in exclude are left out.
+    """
+    return tuple(
+        field for field in model._meta.concrete_fields
+        if not field.primary_key and field.name not in exclude
+    )
+
+
+def _get_clone_fields(model):
+    """
+    The concrete fields copied when cloning a tree, the path is rewritten,
+    the menu root replaced and the pk generated
+    """
+    return get_copy_plan(model, exclude=("path", "menu_root"))
+
+
+def _get_clone_path_sql(connection):
+    """SQL prefixing %s to the path after the %s-th character, None when the backend isn't supported"""
+    if connection.vendor in ("postgresql", "sqlite"):
+        return "%s || SUBSTR({path}, %s)"
+    if connection.vendor == "mysql":
+        return "CONCAT(%s, SUBSTRING({path}, %s))"
+    return None
+
+
+def clone_menu_tree_in_database(root, new_root):
+    """
+    Copies the descendants of root below new_root with a single INSERT ... SELECT that rewrites
+    the path prefix in the database.
+
+    :return: False if the database backend isn't supported, True once the tree is copied
+    """
+    model = root.__class__
+    connection = connections[model._base_manager.db]
+    path_sql = _get_clone_path_sql(connection)
+    if path_sql is None:
+        return False
+
+    quote_name = connection.ops.quote_name
+    columns = ", ".join(quote_name(field.column) for field in _get_clone_fields(model))
+    path = quote_name(model._meta.get_field("path").column)
+    depth = quote_name(model._meta.get_field("depth").column)
+    menu_root = quote_name(model._meta.get_field("menu_root").column)
+    sql = (
+        "INSERT INTO {table} ({path}, {menu_root}, {columns}) "
+        "SELECT {path_sql}, %s, {columns} FROM {table} "
+        "WHERE {menu_root} = %s AND {depth} > %s"
+    ).format(
+        table=quote_name(model._meta.db_table),
+        path=path,
+        depth=depth,
+        menu_root=menu_root,
+        columns=columns,
+        path_sql=path_sql.format(path=path),
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [new_root.path, len(root.path) + 1, new_root.pk, root.pk, root.depth])
+    return True
+
+
+def clone_menu_tree_in_python(root, new_root):
+    """
+    Copies the descendants of root below new_root with a bulk_create. The originals are read
+    as values_list tuples of the copied columns rather than as model instances.
+    """
+    model = root.__class__
+    attnames = [field.attname for field in _get_clone_fields(model)]
+    rows = (
+        model._base_manager.filter(menu_root=root, depth__gt=root.depth)
+        .order_by("path")
+        .values_list("path", *attnames)
+    )
+    prefix_length = len(root.path)
+    to_create = [
+        model(path=new_root.path + row[0][prefix_length:], menu_root_id=new_root.pk, **dict(zip(attnames, row[1:])))
+        for row in rows.iterator()
+    ]
+    model._base_manager.bulk_create(to_create, batch_size=BULK_CREATE_BATCH_SIZE)
+
+
+def clone_menu_tree(root, new_root):
+    """
+    Copies the descendants of root below new_root, both roots of a menu, keeping their position.
+    The copy runs in the database when the backend supports it, and falls back to copying in Python.
+    """
+    if not clone_menu_tree_in_database(root, new_root):
+        clone_menu_tree_in_python(root, new_root)
+
+
+def delete_menu_tree(root, batch_size=BULK_CREATE_BATCH_SIZE):
+    """
+    Deletes root and all its descendants, batch_size menu items at a time selected by their
+    indexed menu_root. The MenuContent using root must have been deleted first.
+
+    :return: A generator of the number of menu items deleted by each batch
+    """
+    model = root.__class__
+    items = model._base_manager.filter(menu_root=root)
+    while True:
+        # Delete the deepest items first, so that an interrupted run never leaves a child without its parent
+        pks = list(items.order_by("-path").values_list("pk", flat=True)[:batch_size])
+        if not pks:
+            return
+        model._base_manager.filter(pk__in=pks).delete()
+        yield len(pks)
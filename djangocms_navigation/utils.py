@@ -10,6 +10,8 @@ from menus.menu_pool import menu_pool
 from djangocms_versioning.constants import DRAFT, PUBLISHED
 from djangocms_versioning.helpers import remove_published_where
 
+from .cache import invalidate_navigation_cache
+
 
 def get_admin_name(model, name):
     name = '{}_{}_{}'.format(
@@ -73,6 +75,7 @@ def get_versionable_for_content(content):
 
 def purge_menu_cache(site_id=None, language=None):
     menu_pool.clear(site_id=site_id, language=language)
+    invalidate_navigation_cache(site_id=site_id, language=language)
 
 
 def is_preview_or_edit_mode(request):
@@ -1,15 +1,32 @@
 from django.apps import apps
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.messages import get_messages
-from django.db.models import Q
+from django.core.cache import cache
+from django.db.models import (
+    Case,
+    Exists,
+    IntegerField,
+    OuterRef,
+    Q,
+    Subquery,
+    Value,
+    When,
+)
 from django.http import HttpResponseBadRequest, JsonResponse
+from django.shortcuts import get_object_or_404
 from django.views.generic import View
 
-from cms.models import Page
+from cms.models import Page, PageContent
 from cms.utils import get_current_site, get_language_from_request
 
 from djangocms_versioning.constants import ARCHIVED, UNPUBLISHED
 
+from djangocms_navigation.cache import (
+    get_select2_cache_generation,
+    get_select2_cache_key,
+)
+from djangocms_navigation.conf import SELECT2_CACHE_TTL, SELECT2_PAGE_SIZE
+from djangocms_navigation.search import get_search_backend
 from djangocms_navigation.utils import is_model_supported, supported_models
 
 
@@ -34,25 +51,101 @@ class ContentObjectSelect2View(View):
         if not is_model_supported(self.menu_content_model, model):
             return HttpResponseBadRequest()
 
-        queryset_data = self.get_data()
+        if not SELECT2_CACHE_TTL:
+            return JsonResponse(self.get_results())
 
-        # Removing unpublished pages from queryset
-        if model == Page:
-            queryset_data = [
-                page for page in queryset_data
-                if not getattr(page.get_title_obj().versions.first(), "state", None) in [ARCHIVED, UNPUBLISHED]
-            ]
+        # Editors type incrementally, the results are cached for a short time
+        generation = get_select2_cache_generation(content_object.pk)
+        cache_key = self.get_cache_key(content_object.pk, generation, self.request.GET.get("query"))
+        data = cache.get(cache_key)
+        if data is None:
+            data = self.get_results()
+            cache.set(cache_key, data, SELECT2_CACHE_TTL)
+        return JsonResponse(data)
 
-        data = {
-            "results": [{"text": str(obj), "id": obj.pk} for obj in queryset_data]
+    def get_results(self):
+        objects, more = self.paginate(self.get_data())
+        return {
+            "results": [{"text": str(obj), "id": obj.pk} for obj in objects],
+            "more": more,
         }
-        return JsonResponse(data)
 
-    def get_data(self):
-        content_type_id = self.request.GET.get("content_type_id", None)
+    def get_page_params(self):
+        """Returns the requested page number and the pk the page starts after"""
+        try:
+            after = int(self.request.GET.get("after"))
+        except (TypeError, ValueError):
+            after = None
+        try:
+            page = max(int(self.request.GET.get("page", 1)), 1)
+        except (TypeError, ValueError):
+            page = 1
+        return page, after
+
+    def get_cache_key(self, content_type_id, generation, query, page_params=None):
+        """
+        Returns the cache key of the results of the query for the site, language and pk of the request,
+        on the requested page unless page_params are given
+        """
+        params = (
+            self.request.GET.get("site") or get_current_site().pk,
+            get_language_from_request(self.request),
+            self.request.GET.get("pk"),
+            query,
+            page_params or self.get_page_params(),
+        )
+        return get_select2_cache_key(content_type_id, generation, params)
+
+    def get_cached_prefix_pks(self, content_type_id, query, backend, search_fields):
+        """
+        Returns the pks of the complete cached results of the longest prefix of the query, or None.
+        When all the search fields are substring lookups they contain every result of the query,
+        so the search can be narrowed to them.
+        """
+        if not SELECT2_CACHE_TTL or not backend.narrows_prefixes or self.request.GET.get("pk"):
+            return None
+        if not all(field.endswith("__icontains") for field in search_fields):
+            return None
+
+        generation = get_select2_cache_generation(content_type_id)
+        first_page = (1, None)
+        keys = [
+            self.get_cache_key(content_type_id, generation, query[:length], first_page)
+            for length in range(len(query) - 1, 0, -1)
+        ]
+        cached = cache.get_many(keys)
+        for key in keys:
+            data = cached.get(key)
+            if data is not None and not data["more"]:
+                return [result["id"] for result in data["results"]]
+        return None
+
+    def paginate(self, queryset):
+        """
+        Returns a page of SELECT2_PAGE_SIZE objects ordered by pk, and whether there are more.
+        The widget sends the pk of the last object it received as "after", so following pages
+        are read with a keyset lookup, "page" is only used as an offset when "after" is missing.
+        """
+        queryset = queryset.order_by("pk")
+        page, after = self.get_page_params()
+
+        if after is not None:
+            queryset = queryset.filter(pk__gt=after)
+            offset = 0
+        else:
+            offset = (page - 1) * SELECT2_PAGE_SIZE
+        # Fetch a single extra row to find out if there is a next page without counting the results
+        objects = list(queryset[offset:offset + SELECT2_PAGE_SIZE + 1])
+        return objects[:SELECT2_PAGE_SIZE], len(objects) > SELECT2_PAGE_SIZE
+
+    def get_data(self, content_object=None):
+        """
+        :param content_object: The ContentType to search, defaults to the content_type_id of the request
+        """
         query = self.request.GET.get("query", None)
         site = self.request.GET.get("site", get_current_site())
-        content_object = ContentType.objects.get_for_id(content_type_id)
+        if content_object is None:
+            content_object = ContentType.objects.get_for_id(self.request.GET.get("content_type_id", None))
         model = content_object.model_class()
         language = get_language_from_request(self.request)
 
@@ -81,17 +174,159 @@ class ContentObjectSelect2View(View):
         if model == Page:
             # limit the queryset to objects for the correct site and language
             queryset = queryset.filter(pagecontent_set__language=language, node__site=site).distinct()
+            queryset = self.exclude_unpublished_pages(queryset, language)
 
         if not query:
             return queryset
 
         # Filter against field(s) defined on the CMSAppConfig.navigation_models attribute
         search_fields = supported_models(self.menu_content_model).get(model)
-        query_dict = {field: query for field in search_fields}
-        # build the filter query using the OR operator to search against all defined fields
-        query = Q(**query_dict, _connector=Q.OR)
-        # the filter could be across tables so distinct should be used
-        return queryset.filter(query).distinct()
+        backend = get_search_backend()
+        cached_pks = self.get_cached_prefix_pks(content_object.pk, query, backend, search_fields)
+        if cached_pks is not None:
+            queryset = queryset.filter(pk__in=cached_pks)
+        return backend.search(queryset, query, search_fields)
+
+    def exclude_unpublished_pages(self, queryset, language):
+        """
+        Removes the pages whose latest version in the language is archived or unpublished.
+        The state of the latest version is annotated with a subquery, so that the pages
+        are filtered by the database rather than one by one.
+        """
+        latest_version_state = (
+            PageContent._base_manager.filter(page=OuterRef("pk"), language=language, versions__isnull=False)
+            .order_by("-versions__pk")
+            .values("versions__state")[:1]
+        )
+        return queryset.annotate(latest_version_state=Subquery(latest_version_state)).filter(
+            Q(latest_version_state__isnull=True) | ~Q(latest_version_state__in=[ARCHIVED, UNPUBLISHED])
+        )
+
+
+class ContentObjectSearchView(ContentObjectSelect2View):
+    """
+    Searches the objects of every model registered in navigation_models at once, so that
+    the content object can be picked without selecting its content type first.
+    Each model returns its SELECT2_PAGE_SIZE most relevant results, which are merged by relevance.
+    """
+
+    def get(self, request, *args, **kwargs):
+        query = self.request.GET.get("query", "").strip()
+        if not query:
+            return HttpResponseBadRequest()
+
+        # Models without search fields would list all of their objects for any query
+        models = [model for model, search_fields in supported_models(self.menu_content_model).items() if search_fields]
+        content_types = ContentType.objects.get_for_models(*models)
+        results = []
+        for model_position, model in enumerate(models):
+            content_type = content_types[model]
+            # Rank in the database first so that the best matches are the ones kept by the slice
+            queryset = self.get_data(content_type).annotate(
+                search_rank=self.get_rank_expression(model, query, supported_models(self.menu_content_model)[model])
+            )
+            for obj in queryset.order_by("search_rank", "pk")[:SELECT2_PAGE_SIZE]:
+                text = str(obj)
+                results.append((self.get_relevance(text, query), model_position, obj.pk, {
+                    "id": "{}:{}".format(content_type.pk, obj.pk),
+                    "text": text,
+                    "content_type_id": content_type.pk,
+                    "object_id": obj.pk,
+                    "type": str(model._meta.verbose_name),
+                }))
+        results.sort(key=lambda result: result[:3])
+        return JsonResponse({"results": [result[-1] for result in results], "more": False})
+
+    def get_rank_expression(self, model, query, search_fields):
+        """
+        Ranks the objects as get_relevance does, from their search fields rather than their text:
+        exact matches first, then prefix matches, word prefix matches and other matches. Each
+        lookup is an EXISTS subquery, so lookups across related tables don't multiply the rows.
+        """
+        manager = model._base_manager
+        conditions = {rank: [] for rank in range(3)}
+        for field in search_fields:
+            if not field.endswith("__icontains"):
+                # Other lookups are kept as configured, their matches rank as exact matches
+                conditions[0].append({field: query})
+                continue
+            prefix = field[:-len("icontains")]
+            conditions[0].append({prefix + "iexact": query})
+            conditions[1].append({prefix + "istartswith": query})
+            conditions[2].append({prefix + "icontains": " " + query})
+        return Case(
+            *(
+                When(Exists(manager.filter(pk=OuterRef("pk"), **lookup)), then=Value(rank))
+                for rank, lookups in conditions.items()
+                for lookup in lookups
+            ),
+            default=Value(3),
+            output_field=IntegerField(),
+        )
+
+    def get_relevance(self, text, query):
+        """Ranks exact matches first, then prefix matches, word prefix matches and other matches"""
+        text = text.lower()
+        query = query.lower()
+        if text == query:
+            return 0
+        if text.startswith(query):
+            return 1
+        if any(word.startswith(query) for word in text.split()):
+            return 2
+        return 3
+
+
+class MenuItemSelect2View(View):
+    """
+    Select2 endpoint listing the menu items of a single MenuContent tree,
+    used to pick the relative node in the menu item form.
+    """
+    menu_content_model = None
+    menu_item_model = None
+
+    def get(self, request, menu_content_id, *args, **kwargs):
+        root_id = get_object_or_404(self.menu_content_model._base_manager, id=menu_content_id).root_id
+
+        try:
+            page = max(int(self.request.GET.get("page", 1)), 1)
+        except (TypeError, ValueError):
+            page = 1
+
+        queryset = self.get_data(root_id)
+        offset = (page - 1) * SELECT2_PAGE_SIZE
+        # Fetch a single extra row to find out if there is a next page without counting the whole tree
+        items = list(queryset[offset:offset + SELECT2_PAGE_SIZE + 1])
+
+        data = {
+            "results": [
+                {"text": self.get_text(item), "id": item.pk} for item in items[:SELECT2_PAGE_SIZE]
+            ],
+            "more": len(items) > SELECT2_PAGE_SIZE,
+        }
+        return JsonResponse(data)
+
+    def get_data(self, root_id):
+        query = self.request.GET.get("query", None)
+        queryset = self.menu_item_model._base_manager.filter(
+            menu_root=root_id,
+        ).only("pk", "title", "depth").order_by("path")
+
+        try:
+            pk = int(self.request.GET.get("pk"))
+        except (TypeError, ValueError):
+            pk = None
+
+        if pk:
+            queryset = queryset.filter(pk=pk)
+
+        if query:
+            queryset = queryset.filter(title__icontains=query)
+        return queryset
+
+    def get_text(self, item):
+        """Indent the title by the item depth so the tree structure stays readable"""
+        return "{}{}".format("- " * (item.depth - 1), item.title)
 
 
 class MessageStorageView(View):
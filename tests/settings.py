@@ -38,6 +38,10 @@ HELPER_SETTINGS = {
     ),
     "DEFAULT_AUTO_FIELD": "django.db.models.AutoField",
     "ROOT_URLCONF": "tests.urls",
+    # The select2 result cache is enabled in the tests that cover it
+    "DJANGOCMS_NAVIGATION_SELECT2_CACHE_TTL": 0,
+    # The navigation node cache is enabled in the tests that cover it
+    "DJANGOCMS_NAVIGATION_NODE_CACHE_TTL": 0,
 }
 
 
@@ -9,9 +9,10 @@ from django.contrib import admin
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.messages import get_messages
 from django.contrib.sites.models import Site
+from django.db import connection
 from django.shortcuts import reverse
 from django.test import RequestFactory
-from django.test.utils import override_settings
+from django.test.utils import CaptureQueriesContext, override_settings
 from django.utils.translation import gettext_lazy as _
 
 from cms.api import add_plugin, create_page, create_title
@@ -33,6 +34,7 @@ from djangocms_navigation.admin import (
 from djangocms_navigation.compat import TREEBEARD_4_5
 from djangocms_navigation.models import Menu, MenuContent, MenuItem
 from djangocms_navigation.test_utils import factories
+from djangocms_navigation.test_utils.app_1.models import TestModel1
 
 from .utils import UsefulAssertsMixin, disable_versioning_for_navigation
 
@@ -198,6 +200,30 @@ class MenuContentAdminViewTestCase(CMSTestCase):
             self.assertEqual(site3_query_result.count(), 1)
             self.assertEqual(site3_query_result.first(), site_3_menu_version.content)
 
+    def test_menucontent_changelist_queries_do_not_grow_with_the_menus(self):
+        """
+        The relations displayed in the changelist columns are fetched with the changelist queryset,
+        so the number of queries doesn't grow with the number of menus
+        """
+        site = Site.objects.get_current()
+        changelist_url = reverse("admin:djangocms_navigation_menucontent_changelist")
+        self.client.force_login(self.get_superuser())
+
+        def get_changelist_queries():
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(changelist_url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.context["cl"].result_list), MenuContent._base_manager.count())
+            return len(queries)
+
+        factories.MenuVersionFactory.create_batch(3, content__menu__site=site, state=PUBLISHED)
+        # Warm up the ContentType and permission caches
+        get_changelist_queries()
+        queries = get_changelist_queries()
+        factories.MenuVersionFactory.create_batch(3, content__menu__site=site, state=PUBLISHED)
+
+        self.assertEqual(get_changelist_queries(), queries)
+
     @patch('djangocms_navigation.admin.using_version_lock', False)
     def test_list_display_without_version_locking(self):
         request = self.get_request("/")
@@ -277,6 +303,71 @@ class MenuContentAdminViewTestCase(CMSTestCase):
         self.assertIn(menu_content_admin._get_main_navigation_link, actions)
 
 
+class MenuContentExportViewTestCase(CMSTestCase):
+    def test_export_view_streams_ndjson(self):
+        menu_content = factories.MenuContentWithVersionFactory()
+        factories.ChildMenuItemFactory(parent=menu_content.root)
+        export_url = reverse(
+            "admin:djangocms_navigation_menucontent_export", args=(menu_content.pk,)
+        )
+
+        with self.login_user_context(self.get_superuser()):
+            response = self.client.get(export_url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(json.loads(lines[0])["identifier"], menu_content.menu.identifier)
+
+    def test_export_view_invalid_format(self):
+        menu_content = factories.MenuContentWithVersionFactory()
+        export_url = reverse(
+            "admin:djangocms_navigation_menucontent_export", args=(menu_content.pk,)
+        )
+
+        with self.login_user_context(self.get_superuser()):
+            response = self.client.get(export_url, {"format": "xml"})
+
+        self.assertEqual(response.status_code, 400)
+
+
+class MenuContentCompareViewTestCase(CMSTestCase):
+    def setUp(self):
+        self.client.force_login(self.get_superuser())
+        self.published = factories.MenuContentWithVersionFactory(version__state=PUBLISHED, language="en")
+        factories.ChildMenuItemFactory(parent=self.published.root, title="About")
+        self.draft = self.published.versions.get().copy(self.get_superuser()).content
+        factories.ChildMenuItemFactory(parent=self.draft.root, title="Contact")
+
+    def test_compare_view_defaults_to_the_published_version(self):
+        compare_url = reverse("admin:djangocms_navigation_menucontent_compare", args=(self.draft.pk,))
+
+        response = self.client.get(compare_url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["compare_to"], self.published)
+        statuses = {entry.item["title"]: entry.status for entry in response.context["diff"]}
+        self.assertEqual(statuses["About"], "unchanged")
+        self.assertEqual(statuses["Contact"], "added")
+        self.assertContains(response, 'class="menu-diff-added"')
+
+    def test_compare_view_with_compare_to(self):
+        compare_url = reverse("admin:djangocms_navigation_menucontent_compare", args=(self.published.pk,))
+
+        response = self.client.get(compare_url, {"compare_to": self.draft.pk})
+
+        statuses = {entry.item["title"]: entry.status for entry in response.context["diff"]}
+        self.assertEqual(statuses["Contact"], "removed")
+
+    def test_compare_view_non_existing_menu_content(self):
+        compare_url = reverse("admin:djangocms_navigation_menucontent_compare", args=(9999,))
+
+        response = self.client.get(compare_url)
+
+        self.assertEqual(response.status_code, 404)
+
+
 class MenuItemModelAdminTestCase(CMSTestCase):
     def setUp(self):
         self.site = admin.AdminSite()
@@ -557,6 +648,41 @@ class MenuItemAdminChangeViewTestCase(CMSTestCase, UsefulAssertsMixin):
         )
         mocked_check.assert_called_once_with(self.get_superuser())
 
+    @patch("djangocms_versioning.models.Version.check_modify")
+    def test_version_and_modify_check_are_resolved_once_per_request(self, mocked_check):
+        mocked_check.side_effect = ConditionFailed("Go look at some cat pictures instead")
+        menu_content = factories.MenuContentWithVersionFactory(
+            version__created_by=self.get_superuser()
+        )
+        model_admin = MenuItemAdmin(MenuItem, admin.AdminSite())
+        request = RequestFactory().get("/")
+        request.user = self.get_superuser()
+        request.menu_content_id = menu_content.pk
+
+        with self.assertNumQueries(2):
+            self.assertEqual(model_admin._get_modify_error(request), "Go look at some cat pictures instead")
+        with self.assertNumQueries(0):
+            self.assertEqual(model_admin._get_modify_error(request), "Go look at some cat pictures instead")
+            self.assertEqual(model_admin._get_menu_content(request), menu_content)
+            self.assertEqual(model_admin._get_version(request).object_id, menu_content.pk)
+        mocked_check.assert_called_once_with(self.get_superuser())
+
+    @patch("djangocms_navigation.admin.content_is_unlocked_for_user", create=True)
+    def test_lock_state_is_resolved_once_per_request(self, mocked_unlocked):
+        mocked_unlocked.return_value = True
+        menu_content = factories.MenuContentWithVersionFactory()
+        model_admin = MenuItemAdmin(MenuItem, admin.AdminSite())
+        request = RequestFactory().get("/")
+        request.user = self.get_superuser()
+        request.menu_content_id = menu_content.pk
+
+        with patch("djangocms_navigation.admin.using_version_lock", True):
+            self.assertTrue(model_admin.has_change_permission(request, menu_content))
+            self.assertTrue(model_admin.has_delete_permission(request, menu_content))
+            self.assertTrue(model_admin.has_change_permission(request, menu_content))
+
+        mocked_unlocked.assert_called_once_with(menu_content, self.get_superuser())
+
     @patch("django.contrib.messages.error")
     def test_menuitem_change_view_redirects_if_not_latest_version_get(
         self, mocked_messages
@@ -1234,6 +1360,62 @@ class MenuItemAdminChangeListViewTestCase(CMSTestCase, UsefulAssertsMixin):
         'permissions': 60,
     },
 )
+class MenuItemAdminSearchTestCase(CMSTestCase):
+    def setUp(self):
+        self.client.force_login(self.get_superuser())
+        self.menu_content = factories.MenuContentWithVersionFactory()
+        self.services = factories.ChildMenuItemFactory(parent=self.menu_content.root, title="Services")
+        self.consulting = factories.ChildMenuItemFactory(parent=self.services, title="Consulting")
+        self.training = factories.ChildMenuItemFactory(parent=self.services, title="Training")
+        self.about = factories.ChildMenuItemFactory(parent=self.menu_content.root, title="About")
+        # A match in another menu must not be listed
+        other_menu_content = factories.MenuContentWithVersionFactory()
+        factories.ChildMenuItemFactory(parent=other_menu_content.root, title="Consulting")
+        self.list_url = reverse(
+            "admin:djangocms_navigation_menuitem_list", args=(self.menu_content.id,)
+        )
+
+    def test_search_returns_matches_with_their_ancestors(self):
+        response = self.client.get(self.list_url, {"q": "consult"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            list(response.context["cl"].result_list),
+            [self.menu_content.root, self.services, self.consulting],
+        )
+
+    def test_search_matches_linked_content(self):
+        page_content = factories.PageContentWithVersionFactory(title="Contact us")
+        contact = factories.ChildMenuItemFactory(
+            parent=self.about, title="Reach out", content=page_content.page
+        )
+
+        response = self.client.get(self.list_url, {"q": "contact us"})
+
+        self.assertEqual(
+            list(response.context["cl"].result_list),
+            [self.menu_content.root, self.about, contact],
+        )
+
+    def test_search_ignores_the_content_of_models_without_search_fields(self):
+        factories.ChildMenuItemFactory(parent=self.about, title="Other", content=TestModel1.objects.create())
+
+        response = self.client.get(self.list_url, {"q": "consult"})
+
+        self.assertEqual(
+            list(response.context["cl"].result_list),
+            [self.menu_content.root, self.services, self.consulting],
+        )
+
+    def test_empty_search_returns_the_whole_tree(self):
+        response = self.client.get(self.list_url, {"q": " "})
+
+        self.assertEqual(
+            list(response.context["cl"].result_list),
+            [self.menu_content.root, self.services, self.consulting, self.training, self.about],
+        )
+
+
 class MenuItemAdminDeleteViewTestCase(CMSTestCase):
     def setUp(self):
         self.user = self.get_superuser()
@@ -1620,6 +1802,66 @@ class MenuItemAdminMoveNodeViewTestCase(CMSTestCase):
         self.assertFalse(child_of_child.is_sibling_of(child))
 
 
+class MenuItemAdminMoveNodesViewTestCase(CMSTestCase):
+    def setUp(self):
+        self.user = self.get_superuser()
+        self.client.force_login(self.user)
+        self.menu_content = factories.MenuContentWithVersionFactory(version__created_by=self.user)
+        self.child = factories.ChildMenuItemFactory(parent=self.menu_content.root)
+        self.child_of_child = factories.ChildMenuItemFactory(parent=self.child)
+        self.move_url = reverse(
+            "admin:djangocms_navigation_menuitem_move_nodes", args=(self.menu_content.id,)
+        )
+
+    def test_menuitem_move_nodes(self):
+        moves = [
+            {"node_id": self.child_of_child.pk, "sibling_id": self.menu_content.root.pk, "as_child": 1},
+            {"node_id": self.child_of_child.pk, "sibling_id": self.child.pk, "as_child": 0},
+        ]
+
+        response = self.client.post(self.move_url, data={"moves": json.dumps(moves)})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"updated": 3})
+        self.assertEqual(
+            list(self.menu_content.root.get_children()), [self.child_of_child, self.child]
+        )
+
+    def test_menuitem_move_nodes_with_structure(self):
+        structure = [{"node_id": self.child_of_child.pk, "parent_id": self.menu_content.root.pk}]
+
+        response = self.client.post(self.move_url, data={"structure": json.dumps(structure)})
+
+        self.assertEqual(response.status_code, 200)
+        self.child_of_child.refresh_from_db()
+        self.assertTrue(self.child_of_child.is_sibling_of(self.child))
+
+    def test_menuitem_move_nodes_invalid_move(self):
+        moves = [{"node_id": self.child.pk, "sibling_id": self.child_of_child.pk, "as_child": 1}]
+
+        response = self.client.post(self.move_url, data={"moves": json.dumps(moves)})
+
+        self.assertEqual(response.status_code, 400)
+        self.child.refresh_from_db()
+        self.assertTrue(self.child.is_child_of(self.menu_content.root))
+
+    def test_menuitem_move_nodes_get_not_allowed(self):
+        response = self.client.get(self.move_url)
+
+        self.assertEqual(response.status_code, 405)
+
+    @patch("djangocms_versioning.models.Version.check_modify")
+    def test_menuitem_move_nodes_does_modify_check_once(self, mocked_check):
+        mocked_check.side_effect = ConditionFailed("Go look at some cat pictures instead")
+        moves = [{"node_id": self.child_of_child.pk, "sibling_id": self.menu_content.root.pk, "as_child": 1}]
+
+        response = self.client.post(self.move_url, data={"moves": json.dumps(moves * 3)})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(b"Go look at some cat pictures instead", response.content)
+        mocked_check.assert_called_once_with(self.user)
+
+
 class MenuItemMainNavigationViewTestCase(CMSTestCase):
     @override_settings(DJANGOCMS_NAVIGATION_MAIN_NAVIGATION_ENABLED=True)
     @patch("djangocms_navigation.admin.purge_menu_cache")
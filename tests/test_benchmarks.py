@@ -0,0 +1,145 @@
+import os
+import time
+import tracemalloc
+from copy import deepcopy
+from unittest import skipUnless
+
+from django.contrib.contenttypes.models import ContentType
+from django.test import TestCase
+
+from djangocms_versioning import versionables
+from djangocms_versioning.models import Version
+
+from djangocms_navigation.helpers import proxy_model
+from djangocms_navigation.models import MenuContent, MenuItem
+from djangocms_navigation.test_utils import factories
+from djangocms_navigation.tree import (
+    clone_menu_tree_in_database,
+    clone_menu_tree_in_python,
+    restructure_menu_tree,
+)
+
+
+def build_menu_tree(children, grandchildren):
+    """Creates a menu tree of children * (grandchildren + 1) items below a new root with two bulk inserts"""
+    root = factories.RootMenuItemFactory(numchild=children)
+    child_paths = [MenuItem._get_path(root.path, 2, position) for position in range(1, children + 1)]
+    MenuItem._base_manager.bulk_create(
+        MenuItem(path=path, depth=2, numchild=grandchildren, menu_root=root, title="Item {}".format(path))
+        for path in child_paths
+    )
+    MenuItem._base_manager.bulk_create(
+        (
+            MenuItem(path=path, depth=3, numchild=0, menu_root=root, title="Item {}".format(path))
+            for path in (
+                MenuItem._get_path(child_path, 3, position)
+                for child_path in child_paths
+                for position in range(1, grandchildren + 1)
+            )
+        ),
+        batch_size=1000,
+    )
+    return root
+
+
+@skipUnless(os.environ.get("DJANGOCMS_NAVIGATION_BENCHMARKS"), "Set DJANGOCMS_NAVIGATION_BENCHMARKS to run")
+class CloneMenuTreeBenchmark(TestCase):
+    def _benchmark(self, clone):
+        new_root = MenuItem.add_root(title="Copy")
+        start = time.perf_counter()
+        clone(self.root, new_root)
+        return time.perf_counter() - start
+
+    def test_clone_10k_items(self):
+        # 100 children with 99 children each
+        self.root = build_menu_tree(100, 99)
+
+        in_database = self._benchmark(clone_menu_tree_in_database)
+        in_python = self._benchmark(clone_menu_tree_in_python)
+
+        print("\nClone 10k menu items: INSERT ... SELECT {:.3f}s, python {:.3f}s".format(in_database, in_python))
+        # The original tree and two copies of the root and its 10k descendants
+        self.assertEqual(MenuItem._base_manager.count(), 3 * 10001)
+
+
+@skipUnless(os.environ.get("DJANGOCMS_NAVIGATION_BENCHMARKS"), "Set DJANGOCMS_NAVIGATION_BENCHMARKS to run")
+class MenuTreeBenchmark(TestCase):
+    """Read, insert and move costs of the materialized path tree on a 10k items menu"""
+
+    def setUp(self):
+        # 100 children with 99 children each
+        self.root = build_menu_tree(100, 99)
+        self.children = list(MenuItem.objects.filter(menu_root=self.root, depth=2).order_by("path"))
+
+    def _measure(self, label, operation):
+        start = time.perf_counter()
+        result = operation()
+        print("\n{}: {:.3f}s".format(label, time.perf_counter() - start))
+        return result
+
+    def test_read(self):
+        menu = self._measure("Read the 10k items menu", lambda: list(MenuItem.objects.filter(menu_root=self.root)))
+        subtree = self._measure("Read a 100 items subtree", lambda: list(self.children[50].get_descendants()))
+        leaf = self.children[50].get_last_child()
+        ancestors = self._measure("Read the ancestors of a leaf", lambda: list(leaf.get_ancestors()))
+
+        self.assertEqual((len(menu), len(subtree), len(ancestors)), (10001, 99, 2))
+
+    def test_insert(self):
+        self._measure("Append a child", lambda: self.children[-1].add_child(title="Last"))
+        self._measure(
+            "Insert a first sibling, shifting every subtree",
+            lambda: self.children[0].add_sibling("first-sibling", title="First"),
+        )
+
+        self.assertEqual(MenuItem.objects.filter(menu_root=self.root).count(), 10003)
+
+    def test_move(self):
+        first, last = self.children[0], self.children[-1]
+        self._measure("Move the last subtree before the first one with treebeard", lambda: last.move(first, "left"))
+        changed = self._measure(
+            "Move it back with restructure_menu_tree",
+            lambda: restructure_menu_tree(self.root, moves=[{"node_id": first.pk, "sibling_id": last.pk}]),
+        )
+
+        self.assertGreater(changed, 0)
+
+
+def deepcopy_proxy_model(obj, content_model):
+    """The previous implementation of proxy_model"""
+    obj_ = deepcopy(obj)
+    obj_.__class__ = versionables.for_content(content_model).version_model_proxy
+    return obj_
+
+
+@skipUnless(os.environ.get("DJANGOCMS_NAVIGATION_BENCHMARKS"), "Set DJANGOCMS_NAVIGATION_BENCHMARKS to run")
+class ProxyModelBenchmark(TestCase):
+    def _benchmark(self, convert, versions):
+        tracemalloc.start()
+        start = time.perf_counter()
+        proxies = [convert(version, MenuContent) for version in versions]
+        duration = time.perf_counter() - start
+        allocated = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        self.assertEqual(len(proxies), len(versions))
+        return duration, allocated
+
+    def test_proxy_200_versions_with_prefetched_relations(self):
+        for _ in range(200):
+            menu_content = factories.MenuContentWithVersionFactory()
+            factories.ChildMenuItemFactory.create_batch(5, parent=menu_content.root)
+        versions = list(
+            Version.objects.filter(content_type=ContentType.objects.get_for_model(MenuContent))
+            .select_related("created_by")
+            .prefetch_related("content", "statetracking_set")
+        )
+
+        deep = self._benchmark(deepcopy_proxy_model, versions)
+        shallow = self._benchmark(proxy_model, versions)
+
+        print(
+            "\nProxy 200 versions: deepcopy {:.3f}s {} KiB, shallow {:.3f}s {} KiB".format(
+                deep[0], deep[1] // 1024, shallow[0], shallow[1] // 1024
+            )
+        )
+        self.assertLess(shallow[1], deep[1])
@@ -0,0 +1,116 @@
+import threading
+import time
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from djangocms_navigation.cache import (
+    get_cached_navigation_nodes,
+    get_navigation_cache_generation,
+    get_navigation_cache_key,
+    get_or_build_navigation_nodes,
+    invalidate_navigation_cache,
+)
+
+
+@patch("djangocms_navigation.cache.NODE_CACHE_TTL", 60)
+class GetOrBuildNavigationNodesTestCase(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.lock_key = "{}_lock".format(get_navigation_cache_key(1, "en"))
+
+    def test_nodes_are_built_once(self):
+        self.assertEqual(get_or_build_navigation_nodes(1, "en", lambda: ["first"]), ["first"])
+        self.assertEqual(get_or_build_navigation_nodes(1, "en", lambda: ["second"]), ["first"])
+        self.assertIsNone(cache.get(self.lock_key))
+
+    def test_invalidated_nodes_are_rebuilt(self):
+        get_or_build_navigation_nodes(1, "en", lambda: ["first"])
+        invalidate_navigation_cache(site_id=1)
+
+        self.assertEqual(get_or_build_navigation_nodes(1, "en", lambda: ["second"]), ["second"])
+
+    def test_outdated_nodes_are_served_during_a_rebuild(self):
+        get_or_build_navigation_nodes(1, "en", lambda: ["first"])
+        invalidate_navigation_cache()
+        cache.add(self.lock_key, "other worker")
+
+        self.assertEqual(get_or_build_navigation_nodes(1, "en", lambda: ["second"]), ["first"])
+
+    @patch("djangocms_navigation.cache.NODE_REBUILD_WAIT", 0.1)
+    def test_nodes_are_built_without_storing_them_when_the_wait_times_out(self):
+        cache.add(self.lock_key, "other worker")
+
+        self.assertEqual(get_or_build_navigation_nodes(1, "en", lambda: ["first"]), ["first"])
+        self.assertIsNone(get_cached_navigation_nodes(1, "en"))
+
+    def test_concurrent_workers_build_the_nodes_once(self):
+        builds = []
+
+        def build():
+            builds.append(1)
+            time.sleep(0.2)
+            return ["nodes"]
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(get_or_build_navigation_nodes(1, "en", build)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(builds), 1)
+        self.assertEqual(results, [["nodes"]] * 5)
+
+    def test_concurrent_workers_starting_from_an_empty_cache_build_the_nodes_once(self):
+        builds = []
+        barrier = threading.Barrier(5)
+
+        def build():
+            builds.append(1)
+            time.sleep(0.2)
+            return ["nodes"]
+
+        def worker():
+            # All the workers read the missing generations at the same time
+            barrier.wait()
+            results.append(get_or_build_navigation_nodes(1, "en", build))
+
+        results = []
+        threads = [threading.Thread(target=worker) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(builds), 1)
+        self.assertEqual(results, [["nodes"]] * 5)
+        self.assertEqual(get_cached_navigation_nodes(1, "en"), ["nodes"])
+
+
+class NavigationCacheGenerationTestCase(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_the_generation_is_kept(self):
+        generation = get_navigation_cache_generation(1, "en")
+
+        self.assertEqual(get_navigation_cache_generation(1, "en"), generation)
+
+    def test_a_generation_stored_by_another_worker_is_not_overwritten(self):
+        get_many = cache.get_many
+
+        def racing_get_many(keys):
+            # Another worker stores the generations between the read and the add
+            cache.set_many({key: "other worker" for key in keys}, None)
+            patched.side_effect = get_many
+            return {}
+
+        with patch.object(cache, "get_many", side_effect=racing_get_many) as patched:
+            generation = get_navigation_cache_generation(1, "en")
+
+        self.assertEqual(generation, ("other worker",) * 3)
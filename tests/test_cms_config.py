@@ -10,7 +10,8 @@ from cms.models import Page
 from cms.utils.setup import configure_cms_apps
 
 from djangocms_navigation import cms_config
-from djangocms_navigation.models import MenuContent
+from djangocms_navigation.models import MenuContent, MenuItem
+from djangocms_navigation.test_utils import factories
 from djangocms_navigation.test_utils.app_1.models import TestModel1, TestModel2
 from djangocms_navigation.test_utils.app_2.models import TestModel3, TestModel4
 from djangocms_navigation.test_utils.polls.models import PollContent
@@ -226,3 +227,25 @@ class ModerationSettingTestCase(TestCase):
             configure_cms_apps([self.moderation_app])
 
         self.assertEqual(len(self.moderation_app.cms_extension.moderated_models), 0)
+
+
+class GetModelFieldsTestCase(TestCase):
+    def test_pk_and_excluded_fields_are_not_copied(self):
+        root = factories.RootMenuItemFactory()
+
+        fields = cms_config._get_model_fields(root, MenuItem, field_exclusion_list=("path", "depth"))
+
+        self.assertNotIn("id", fields)
+        self.assertNotIn("path", fields)
+        self.assertNotIn("depth", fields)
+        self.assertEqual(fields["title"], root.title)
+
+    def test_exclusions_are_not_shared_between_calls(self):
+        root = factories.RootMenuItemFactory()
+        cms_config._get_model_fields(root, MenuItem, field_exclusion_list=("path", "depth"))
+
+        fields = cms_config._get_model_fields(root, MenuItem)
+
+        self.assertIn("path", fields)
+        self.assertIn("depth", fields)
+        self.assertNotIn("id", fields)
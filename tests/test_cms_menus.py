@@ -1,8 +1,16 @@
+from unittest.mock import patch
+
 from django.contrib.sites.models import Site
+from django.core.cache import cache
+from django.db import connection
 from django.template import Template
 from django.template.context import Context
 from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
 
+from cms.models import Page
+from cms.operations import MOVE_PAGE
+from cms.signals import post_obj_operation
 from cms.test_utils.testcases import CMSTestCase
 from cms.test_utils.util.mock import AttributeObject
 from cms.toolbar.toolbar import CMSToolbar
@@ -18,13 +26,15 @@ from djangocms_versioning.constants import (
     UNPUBLISHED,
 )
 
-from djangocms_navigation.cms_menus import CMSMenu
-from djangocms_navigation.models import MenuContent
+from djangocms_navigation.cms_menus import CMSMenu, NavigationSelector
+from djangocms_navigation.models import MenuContent, MenuItemUrl
 from djangocms_navigation.test_utils import factories
 from djangocms_navigation.test_utils.helpers import (
     get_nav_from_response,
     make_main_navigation,
 )
+from djangocms_navigation.test_utils.polls.models import Poll, PollContent
+from djangocms_navigation.utils import purge_menu_cache
 
 from .utils import add_toolbar_to_request, disable_versioning_for_navigation
 
@@ -446,6 +456,193 @@ class CMSMenuTestCase(CMSTestCase):
         self.assertNotIn(draft_child.title, str(response.content))
 
 
+@patch.object(PollContent, "get_absolute_url", lambda self: "/poll/{}/".format(self.pk))
+class CMSMenuUrlCacheTestCase(CMSTestCase):
+    def setUp(self):
+        self.language = "en"
+        self.request = RequestFactory().get("/")
+        self.request.user = factories.UserFactory()
+        self.request.toolbar = CMSToolbar(self.request)
+        self.menu = CMSMenu(menu_pool.get_renderer(self.request))
+        self.poll_content = PollContent.objects.create(poll=Poll.objects.create(name="Poll"), language="en", text="A")
+        self.menu_content = factories.MenuContentWithVersionFactory(language=self.language, version__state=DRAFT)
+        self.child = factories.ChildMenuItemFactory(parent=self.menu_content.root, content=self.poll_content)
+
+    def test_publishing_a_menu_stores_its_urls(self):
+        self.menu_content.versions.get().publish(self.request.user)
+
+        self.assertQuerysetEqual(
+            MenuItemUrl.objects.values_list("menu_item", "language", "url"),
+            [(self.child.pk, self.language, "/poll/{}/".format(self.poll_content.pk))],
+            transform=None,
+        )
+
+    @disable_versioning_for_navigation()
+    def test_builds_read_the_stored_urls_without_loading_the_content(self):
+        MenuItemUrl.objects.create(menu_item=self.child, language=self.language, url="/stored/")
+
+        with patch.object(CMSMenu, "get_url") as get_url, CaptureQueriesContext(connection) as queries:
+            nodes = self.menu.build_nodes(self.request)
+
+        get_url.assert_not_called()
+        self.assertFalse([query for query in queries if PollContent._meta.db_table in query["sql"]])
+        self.assertEqual(nodes[1].url, "/stored/")
+        self.assertEqual(nodes[1].content, self.poll_content)
+
+    @disable_versioning_for_navigation()
+    def test_breadcrumbs_find_the_home_page_without_loading_the_content(self):
+        home_item = factories.ChildMenuItemFactory(
+            parent=self.menu_content.root, content=factories.PageFactory(is_home=True), hide_node=True
+        )
+        other_item = factories.ChildMenuItemFactory(parent=self.menu_content.root, content=factories.PageFactory())
+        for item in (self.child, home_item, other_item):
+            MenuItemUrl.objects.create(menu_item=item, language=self.language, url="/stored/")
+        nodes = self.menu.build_nodes(self.request)
+        home_node = next(node for node in nodes if node.id == home_item.pk)
+
+        with self.assertNumQueries(0):
+            NavigationSelector(menu_pool.get_renderer(self.request)).modify(
+                self.request, nodes, namespace=None, root_id=None, post_cut=False, breadcrumb=True
+            )
+
+        self.assertTrue(home_node.visible)
+        self.assertEqual([node.id for node in nodes if node.is_home], [home_item.pk])
+
+    @disable_versioning_for_navigation()
+    def test_builds_do_not_store_urls(self):
+        nodes = self.menu.build_nodes(self.request)
+
+        self.assertEqual(nodes[1].url, "/poll/{}/".format(self.poll_content.pk))
+        self.assertFalse(MenuItemUrl.objects.exists())
+
+    @disable_versioning_for_navigation()
+    def test_stored_urls_are_not_read_in_edit_mode(self):
+        MenuItemUrl.objects.create(menu_item=self.child, language=self.language, url="/stored/")
+        self.request.toolbar.edit_mode_active = True
+
+        nodes = self.menu.build_nodes(self.request)
+
+        self.assertEqual(nodes[1].url, "/poll/{}/".format(self.poll_content.pk))
+
+    def test_saving_the_content_refreshes_its_urls(self):
+        MenuItemUrl.objects.create(menu_item=self.child, language=self.language, url="/old/")
+
+        self.poll_content.save()
+
+        self.assertEqual(MenuItemUrl.objects.get().url, "/poll/{}/".format(self.poll_content.pk))
+
+    def test_saving_the_menu_item_refreshes_its_urls(self):
+        MenuItemUrl.objects.create(menu_item=self.child, language=self.language, url="/old/")
+        other_poll_content = PollContent.objects.create(
+            poll=Poll.objects.create(name="Other"), language="en", text="B"
+        )
+
+        self.child.refresh_from_db()
+        self.child.content = other_poll_content
+        self.child.save()
+
+        self.assertEqual(MenuItemUrl.objects.get().url, "/poll/{}/".format(other_poll_content.pk))
+
+    @patch.object(Page, "get_absolute_url", lambda self, language=None: "/new/")
+    def test_a_page_operation_refreshes_the_urls_of_the_page_and_its_descendants(self):
+        page = factories.PageFactory(node__path="0001")
+        child = factories.PageFactory(node__path="00010001")
+        other = factories.PageFactory(node__path="0002")
+        for item_page, url in ((page, "/page/"), (child, "/page/child/"), (other, "/other/")):
+            item = factories.ChildMenuItemFactory(parent=self.child, content=item_page)
+            MenuItemUrl.objects.create(menu_item=item, language=self.language, url=url)
+
+        post_obj_operation.send(sender=Page, operation=MOVE_PAGE, request=self.request, token="token", obj=page)
+
+        self.assertQuerysetEqual(
+            MenuItemUrl.objects.order_by("url").values_list("url", flat=True), ["/new/", "/new/", "/other/"],
+            transform=None,
+        )
+
+    def test_publishing_a_page_refreshes_its_urls(self):
+        version = factories.PageVersionFactory(content__language=self.language, state=DRAFT)
+        item = factories.ChildMenuItemFactory(parent=self.child, content=version.content.page)
+        MenuItemUrl.objects.create(menu_item=item, language=self.language, url="/old/")
+        MenuItemUrl.objects.create(menu_item=self.child, language=self.language, url="/poll/")
+
+        version.publish(self.request.user)
+
+        self.assertEqual(
+            MenuItemUrl.objects.get(menu_item=item).url, version.content.page.get_absolute_url(self.language)
+        )
+        self.assertEqual(MenuItemUrl.objects.get(menu_item=self.child).url, "/poll/")
+
+
+@patch("djangocms_navigation.cms_menus.NODE_CACHE_TTL", 60)
+@patch("djangocms_navigation.cache.NODE_CACHE_TTL", 60)
+class CMSMenuNodeCacheTestCase(CMSTestCase):
+    def setUp(self):
+        cache.clear()
+        self.site = get_current_site()
+        self.menu = CMSMenu(menu_pool.get_renderer(RequestFactory().get("/")))
+        for language in ("en", "fr"):
+            menu_content = factories.MenuVersionFactory(
+                content__language=language, content__menu__site=self.site, state=PUBLISHED
+            ).content
+            child = factories.ChildMenuItemFactory(parent=menu_content.root, title="Child " + language)
+            factories.ChildMenuItemFactory(parent=child)
+            factories.ChildMenuItemFactory(parent=menu_content.root)
+
+    def _get_request(self, language):
+        request = RequestFactory().get("/", {"language": language})
+        request.user = factories.UserFactory()
+        request.toolbar = CMSToolbar(request)
+        return request
+
+    def _get_node_values(self, nodes):
+        return [(node.id, node.title, node.url, node.parent_id, node.visible, node.attr) for node in nodes]
+
+    def test_nodes_are_cached_until_the_menu_cache_is_purged(self):
+        request = self._get_request("en")
+        nodes = self.menu.get_nodes(request)
+
+        with patch.object(CMSMenu, "build_nodes") as build_nodes:
+            cached_nodes = self.menu.get_nodes(request)
+        build_nodes.assert_not_called()
+        self.assertEqual(self._get_node_values(cached_nodes), self._get_node_values(nodes))
+
+        purge_menu_cache(site_id=self.site.pk, language="en")
+
+        with patch.object(CMSMenu, "build_nodes", return_value=[]) as build_nodes:
+            self.menu.get_nodes(request)
+            self.menu.get_nodes(self._get_request("fr"))
+        self.assertEqual(build_nodes.call_count, 2)
+
+    def test_nodes_are_not_cached_in_edit_mode(self):
+        request = self._get_request("en")
+        request.toolbar.edit_mode_active = True
+        self.menu.get_nodes(request)
+
+        with patch.object(CMSMenu, "build_nodes", return_value=[]) as build_nodes:
+            self.menu.get_nodes(request)
+
+        build_nodes.assert_called_once_with(request)
+
+    def test_build_nodes_for_languages_matches_the_build_of_each_language(self):
+        nodes = self.menu.build_nodes_for_languages(self._get_request("en"), self.site, ["en", "fr"])
+
+        for language in ("en", "fr"):
+            self.assertEqual(
+                self._get_node_values(nodes[language]),
+                self._get_node_values(self.menu.build_nodes(self._get_request(language))),
+            )
+        self.assertEqual(len(nodes["fr"]), 4)
+
+    def test_cache_nodes_for_languages(self):
+        self.menu.cache_nodes_for_languages(self._get_request("en"), self.site, ["en", "fr"])
+
+        with patch.object(CMSMenu, "build_nodes") as build_nodes:
+            self.menu.get_nodes(self._get_request("en"))
+            self.menu.get_nodes(self._get_request("fr"))
+
+        build_nodes.assert_not_called()
+
+
 class CMSMenuWithPagesTestCase(CMSTestCase):
     def setUp(self):
         self.language = "en"
@@ -0,0 +1,77 @@
+from django.test import TestCase
+
+from djangocms_navigation.diff import (
+    ADDED,
+    CHANGED,
+    MOVED,
+    REMOVED,
+    UNCHANGED,
+    diff_menu_trees,
+)
+from djangocms_navigation.models import MenuItem
+from djangocms_navigation.test_utils import factories
+from djangocms_navigation.tree import clone_menu_tree
+
+
+class DiffMenuTreesTestCase(TestCase):
+    def setUp(self):
+        self.old_root = factories.RootMenuItemFactory(title="Menu")
+        self.about = factories.ChildMenuItemFactory(parent=self.old_root, title="About")
+        self.services = factories.ChildMenuItemFactory(parent=self.old_root, title="Services")
+        factories.ChildMenuItemFactory(parent=self.services, title="Consulting")
+        factories.ChildMenuItemFactory(parent=self.services, title="Training")
+        factories.ChildMenuItemFactory(parent=self.old_root, title="Contact")
+        self.new_root = MenuItem.add_root(title="Menu", numchild=3)
+        clone_menu_tree(self.old_root, self.new_root)
+
+    def _get_new_item(self, title):
+        return MenuItem.get_tree(self.new_root).get(title=title)
+
+    def _get_statuses(self):
+        return {entry.item["title"]: entry.status for entry in diff_menu_trees(self.old_root, self.new_root)}
+
+    def test_identical_trees(self):
+        statuses = self._get_statuses()
+
+        self.assertEqual(set(statuses.values()), {UNCHANGED})
+        self.assertEqual(len(statuses), 6)
+
+    def test_added_and_removed_items(self):
+        self._get_new_item("Training").delete()
+        factories.ChildMenuItemFactory(parent=self._get_new_item("Services"), title="Support")
+
+        statuses = self._get_statuses()
+
+        self.assertEqual(statuses["Training"], REMOVED)
+        self.assertEqual(statuses["Support"], ADDED)
+        self.assertEqual(statuses["Consulting"], UNCHANGED)
+
+    def test_changed_items_are_matched_by_content(self):
+        about = self._get_new_item("About")
+        about.title = "About us"
+        about.hide_node = True
+        about.save()
+
+        diff = diff_menu_trees(self.old_root, self.new_root)
+
+        entry = next(entry for entry in diff if entry.item["title"] == "About us")
+        self.assertEqual(entry.status, CHANGED)
+        self.assertEqual(entry.changed_fields, ["title", "hide_node"])
+        self.assertEqual(entry.old["title"], "About")
+
+    def test_moved_items(self):
+        self._get_new_item("Training").move(self._get_new_item("About"), pos="last-child")
+        self._get_new_item("Contact").move(self._get_new_item("About"), pos="left")
+
+        statuses = self._get_statuses()
+
+        self.assertEqual(statuses["Training"], MOVED)
+        self.assertEqual(statuses["Contact"], MOVED)
+        # The order of the other siblings is kept
+        self.assertEqual(statuses["About"], UNCHANGED)
+        self.assertEqual(statuses["Services"], UNCHANGED)
+        self.assertEqual(statuses["Consulting"], UNCHANGED)
+
+    def test_each_tree_is_loaded_with_one_query(self):
+        with self.assertNumQueries(2):
+            diff_menu_trees(self.old_root, self.new_root)
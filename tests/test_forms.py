@@ -6,10 +6,14 @@ from cms.test_utils.testcases import CMSTestCase
 from cms.utils.compat import DJANGO_4_1
 from cms.utils.urlutils import admin_reverse
 
-from djangocms_navigation.constants import SELECT2_CONTENT_OBJECT_URL_NAME
+from djangocms_navigation.constants import (
+    SEARCH_CONTENT_OBJECT_URL_NAME,
+    SELECT2_CONTENT_OBJECT_URL_NAME,
+)
 from djangocms_navigation.forms import (
     ContentTypeObjectSelectWidget,
     MenuItemForm,
+    RelativeMenuItemSelectWidget,
 )
 from djangocms_navigation.test_utils import factories
 from djangocms_navigation.test_utils.app_1.models import TestModel1, TestModel2
@@ -24,6 +28,7 @@ if DJANGO_4_1:
 class MenuContentFormTestCase(CMSTestCase):
     def setUp(self):
         self.menu_root = factories.RootMenuItemFactory()
+        self.menu_content = factories.MenuContentFactory(root=self.menu_root)
         self.page_content = factories.PageContentFactory()
         self.page_ct = ContentType.objects.get_for_model(Page)
 
@@ -246,8 +251,28 @@ class MenuContentFormTestCase(CMSTestCase):
         self.assertFalse(is_valid)
         self.assertIn("_ref_node_id", form.errors)
         self.assertListEqual(
-            form.errors["_ref_node_id"],
-            ["Select a valid choice. 167 is not one of the available choices."],
+            form.errors["_ref_node_id"], ["You must specify a relative menu item"]
+        )
+
+    def test_invalid_if_relative_node_belongs_to_another_menu(self):
+        child_of_root2 = factories.ChildMenuItemFactory(parent=factories.RootMenuItemFactory())
+        data = {
+            "title": "My new Title",
+            "content_type": self.page_ct.pk,
+            "object_id": self.page_content.page.pk,
+            "_ref_node_id": child_of_root2.id,
+            "numchild": 1,
+            "link_target": "_self",
+            "_position": "first-child",
+        }
+        form = MenuItemForm(menu_root=self.menu_root, data=data)
+
+        is_valid = form.is_valid()
+
+        self.assertFalse(is_valid)
+        self.assertIn("_ref_node_id", form.errors)
+        self.assertListEqual(
+            form.errors["_ref_node_id"], ["The relative menu item must belong to this menu"]
         )
 
     def test_title_is_required(self):
@@ -375,22 +400,16 @@ class MenuContentFormTestCase(CMSTestCase):
         except Exception as e:
             self.fail(str(e))
 
-    def test_only_display_node_tree_of_current_root(self):
+    def test_node_tree_is_not_rendered_in_relative_node_field(self):
         child = factories.ChildMenuItemFactory(parent=self.menu_root)
-        root2 = factories.RootMenuItemFactory()
-        child_of_root2 = factories.ChildMenuItemFactory(parent=root2)
-        form = MenuItemForm(menu_root=self.menu_root)
+        form = MenuItemForm(menu_root=self.menu_content.root)
 
-        menu_item_ids = [choice[0] for choice in form.fields["_ref_node_id"].choices]
-
-        # The menu items that should be in choices are indeed there
-        self.assertIn(self.menu_root.pk, menu_item_ids)
-        self.assertIn(child.pk, menu_item_ids)
-        # Those from other root nodes are not
-        self.assertNotIn(root2.pk, menu_item_ids)
-        self.assertNotIn(child_of_root2.pk, menu_item_ids)
-        # And the general count is correct
-        self.assertEqual(len(form.fields["_ref_node_id"].choices), 3)
+        self.assertNotIn(child.title, str(form["_ref_node_id"]))
+        self.assertIsInstance(form.fields["_ref_node_id"].widget, RelativeMenuItemSelectWidget)
+        self.assertEqual(
+            form.fields["_ref_node_id"].widget.attrs["data-select2-url"],
+            admin_reverse("djangocms_navigation_menuitem_select2", args=[self.menu_content.pk]),
+        )
 
     def test_only_display_supported_content_types(self):
         content_types = ContentType.objects.get_for_models(
@@ -421,3 +440,4 @@ class MenuContentFormTestCase(CMSTestCase):
         self.assertTrue(hasattr(form["dummy_field"], "widget"))
         self.assertIn("data-select2-url", attrs)
         self.assertEqual(attrs["data-select2-url"], expected_url)
+        self.assertEqual(attrs["data-search-url"], admin_reverse(SEARCH_CONTENT_OBJECT_URL_NAME))
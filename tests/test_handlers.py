@@ -0,0 +1,167 @@
+from unittest.mock import call, patch
+
+from django.contrib.sites.models import Site
+from django.core.cache import cache
+from django.db import DatabaseError, transaction
+from django.test import RequestFactory
+
+from cms.models import Page, PageUrl
+from cms.operations import CHANGE_PAGE_TRANSLATION, MOVE_PAGE
+from cms.signals import post_obj_operation
+from cms.test_utils.testcases import CMSTestCase
+
+from djangocms_versioning.constants import DRAFT, PUBLISHED
+
+from djangocms_navigation.cache import (
+    get_cached_navigation_nodes,
+    set_cached_navigation_nodes,
+)
+from djangocms_navigation.models import MenuItemUrl
+from djangocms_navigation.test_utils import factories
+from djangocms_navigation.test_utils.polls.models import Poll, PollContent
+
+
+@patch("djangocms_navigation.handlers.purge_menu_cache")
+class TargetedMenuCachePurgeTestCase(CMSTestCase):
+    def setUp(self):
+        self.user = self.get_superuser()
+        self.page_version = factories.PageVersionFactory(content__language="en", state=DRAFT, created_by=self.user)
+        self.page = self.page_version.content.page
+        self.menu_content = factories.MenuContentWithVersionFactory(language="en")
+        self.item = factories.ChildMenuItemFactory(parent=self.menu_content.root, content=self.page)
+        # A menu in another language linking to the page, and a menu of another site that doesn't
+        factories.ChildMenuItemFactory(
+            parent=factories.MenuContentWithVersionFactory(language="fr", menu__site=self.menu_content.menu.site).root,
+            content=self.page,
+        )
+        self.other_site = Site.objects.create(domain="other.example.com", name="other")
+        factories.ChildMenuItemFactory(
+            parent=factories.MenuContentWithVersionFactory(language="en", menu__site=self.other_site).root
+        )
+
+    def assertOnlyMenuPurged(self, purge_menu_cache):
+        self.assertEqual(
+            purge_menu_cache.call_args_list, [call(site_id=self.menu_content.menu.site_id, language="en")]
+        )
+
+    def test_publishing_a_linked_page_purges_its_menus(self, purge_menu_cache):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.page_version.publish(self.user)
+
+        purge_menu_cache.assert_any_call(site_id=self.menu_content.menu.site_id, language="en")
+        self.assertNotIn(self.other_site.pk, [kwargs["site_id"] for _, kwargs in purge_menu_cache.call_args_list])
+
+    def test_publishing_a_page_outside_of_menus(self, purge_menu_cache):
+        version = factories.PageVersionFactory(content__language="en", state=DRAFT, created_by=self.user)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            version.publish(self.user)
+
+        purge_menu_cache.assert_not_called()
+
+    def test_changing_a_page_url(self, purge_menu_cache):
+        MenuItemUrl.objects.create(menu_item=self.item, language="en", url="/old/")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            PageUrl.objects.create(page=self.page, language="en", slug="new", path="new")
+
+        self.assertEqual(MenuItemUrl.objects.get().url, Page.objects.get(pk=self.page.pk).get_absolute_url("en"))
+        self.assertOnlyMenuPurged(purge_menu_cache)
+
+    def test_saving_a_linked_object_purges_its_menus(self, purge_menu_cache):
+        poll_content = PollContent.objects.create(poll=Poll.objects.create(name="Poll"), language="en", text="A")
+        factories.ChildMenuItemFactory(parent=self.menu_content.root, content=poll_content)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            poll_content.save()
+
+        self.assertOnlyMenuPurged(purge_menu_cache)
+
+    def test_a_page_operation_purges_the_menus_of_the_page_and_its_descendants(self, purge_menu_cache):
+        child = factories.PageFactory(node__path=self.page.node.path + "0001")
+        factories.ChildMenuItemFactory(
+            parent=factories.MenuContentWithVersionFactory(language="de", menu__site=self.other_site).root,
+            content=child,
+        )
+
+        request = RequestFactory().get("/")
+        request.user = self.user
+        with self.captureOnCommitCallbacks(execute=True):
+            post_obj_operation.send(sender=Page, operation=MOVE_PAGE, request=request, token="token", obj=self.page)
+
+        self.assertCountEqual(
+            purge_menu_cache.call_args_list,
+            [
+                call(site_id=self.menu_content.menu.site_id, language="en"),
+                call(site_id=self.menu_content.menu.site_id, language="fr"),
+                call(site_id=self.other_site.pk, language="de"),
+            ],
+        )
+
+    def test_the_menus_are_purged_once_the_transaction_is_committed(self, purge_menu_cache):
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.page_version.publish(self.user)
+            PageUrl.objects.create(page=self.page, language="en", slug="new", path="new")
+
+            purge_menu_cache.assert_not_called()
+
+        self.assertEqual(len(callbacks), 1)
+        callbacks[0]()
+        self.assertOnlyMenuPurged(purge_menu_cache)
+
+    def test_the_menus_are_not_purged_when_the_transaction_is_rolled_back(self, purge_menu_cache):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            try:
+                with transaction.atomic():
+                    PageUrl.objects.create(page=self.page, language="en", slug="new", path="new")
+                    raise DatabaseError
+            except DatabaseError:
+                pass
+
+        self.assertEqual(callbacks, [])
+        purge_menu_cache.assert_not_called()
+
+    def test_other_page_operations_are_ignored(self, purge_menu_cache):
+        MenuItemUrl.objects.create(menu_item=self.item, language="en", url="/old/")
+        request = RequestFactory().get("/")
+        request.user = self.user
+
+        with self.captureOnCommitCallbacks(execute=True):
+            post_obj_operation.send(
+                sender=Page, operation=CHANGE_PAGE_TRANSLATION, request=request, token="token", obj=self.page
+            )
+
+        self.assertEqual(MenuItemUrl.objects.get().url, "/old/")
+        purge_menu_cache.assert_not_called()
+
+
+@patch("djangocms_navigation.handlers.NODE_CACHE_TTL", 60)
+@patch("djangocms_navigation.cache.NODE_CACHE_TTL", 60)
+class MenuCacheRegenerationTestCase(CMSTestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = self.get_superuser()
+        self.page_version = factories.PageVersionFactory(content__language="en", state=DRAFT, created_by=self.user)
+        self.menu_content = factories.MenuContentWithVersionFactory(language="en", version__state=PUBLISHED)
+        self.item = factories.ChildMenuItemFactory(
+            parent=self.menu_content.root, content=self.page_version.content.page
+        )
+        self.site_id = self.menu_content.menu.site_id
+
+    def test_publishing_a_linked_page_caches_the_nodes_of_its_menus_again(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.page_version.publish(self.user)
+
+        nodes = get_cached_navigation_nodes(self.site_id, "en")
+        self.assertEqual([node.id for node in nodes], [self.menu_content.menu.root_id, self.item.pk])
+        self.assertEqual(nodes[1].url, self.page_version.content.page.get_absolute_url("en"))
+        self.assertIsNone(get_cached_navigation_nodes(self.site_id, "fr"))
+
+    def test_publishing_a_page_outside_of_menus_keeps_the_cached_nodes(self):
+        set_cached_navigation_nodes(self.site_id, "en", ["cached"])
+        version = factories.PageVersionFactory(content__language="en", state=DRAFT, created_by=self.user)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            version.publish(self.user)
+
+        self.assertEqual(get_cached_navigation_nodes(self.site_id, "en"), ["cached"])
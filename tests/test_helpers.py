@@ -1,14 +1,22 @@
 from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
 
+from cms.models import Page
 from cms.test_utils.testcases import CMSTestCase
 from cms.test_utils.util.fuzzy_int import FuzzyInt
 
-from djangocms_versioning.constants import PUBLISHED
+from djangocms_versioning.constants import DRAFT, PUBLISHED
+from djangocms_versioning.models import Version
 
 from djangocms_navigation.helpers import (
+    get_menu_contents_for_content_object,
+    get_menu_contents_for_content_objects,
     get_navigation_node_for_content_object,
+    get_navigation_nodes_for_content_objects,
     is_preview_url,
+    proxy_model,
 )
+from djangocms_navigation.models import MenuContent
 from djangocms_navigation.test_utils import factories
 from djangocms_navigation.test_utils.polls.models import Poll, PollContent
 
@@ -137,6 +145,100 @@ class NavigationContentTypeSearchTestCase(CMSTestCase):
         self.assertEqual(result, grandchild2)
 
 
+class GetNavigationNodesForContentObjectsTestCase(CMSTestCase):
+    def setUp(self):
+        self.menu_content = factories.MenuContentFactory()
+        self.pages = [factories.PageContentWithVersionFactory().page for _ in range(3)]
+        self.poll = Poll.objects.create(name="Test poll")
+        self.child = factories.ChildMenuItemFactory(parent=self.menu_content.root, content=self.pages[0])
+        self.nested = factories.ChildMenuItemFactory(parent=self.child, content=self.pages[1])
+        self.poll_node = factories.ChildMenuItemFactory(parent=self.menu_content.root, content=self.poll)
+        # The same page in another menu
+        factories.ChildMenuItemFactory(parent=factories.MenuContentFactory().root, content=self.pages[2])
+        ContentType.objects.get_for_models(Page, Poll)
+
+    def test_nodes_of_a_batch_in_one_query(self):
+        with self.assertNumQueries(1):
+            nodes = get_navigation_nodes_for_content_objects(self.menu_content, self.pages + [self.poll])
+
+        self.assertEqual(nodes, {self.pages[0]: self.child, self.pages[1]: self.nested, self.poll: self.poll_node})
+
+    def test_nodes_are_cached_on_the_request(self):
+        request = self.get_request("/")
+        get_navigation_nodes_for_content_objects(self.menu_content, self.pages[:2], request=request)
+
+        with self.assertNumQueries(1):
+            nodes = get_navigation_nodes_for_content_objects(
+                self.menu_content, self.pages + [self.poll], request=request
+            )
+        with self.assertNumQueries(0):
+            get_navigation_nodes_for_content_objects(self.menu_content, self.pages, request=request)
+
+        self.assertEqual(len(nodes), 3)
+
+
+class GetMenuContentsForContentObjectsTestCase(CMSTestCase):
+    def setUp(self):
+        self.page = factories.PageContentWithVersionFactory().page
+        self.poll = Poll.objects.create(name="Test poll")
+        self.published = factories.MenuVersionFactory(state=PUBLISHED).content
+        self.draft = factories.MenuVersionFactory(state=DRAFT).content
+        self.other = factories.MenuVersionFactory(state=PUBLISHED).content
+        child = factories.ChildMenuItemFactory(parent=self.published.root)
+        factories.ChildMenuItemFactory(parent=child, content=self.page)
+        factories.ChildMenuItemFactory(parent=self.draft.root, content=self.page)
+        factories.ChildMenuItemFactory(parent=self.other.root, content=self.poll)
+        factories.ChildMenuItemFactory(parent=factories.MenuVersionFactory(state=PUBLISHED).content.root)
+
+    def test_published_menus_containing_an_object(self):
+        self.assertQuerysetEqual(get_menu_contents_for_content_object(self.page), [self.published], transform=None)
+
+    def test_all_versions_containing_an_object(self):
+        menu_contents = get_menu_contents_for_content_object(self.page, queryset=MenuContent._base_manager.all())
+
+        self.assertCountEqual(menu_contents, [self.published, self.draft])
+
+    def test_batch_of_objects_in_one_query(self):
+        # The content types are cached after their first use
+        ContentType.objects.get_for_models(Page, Poll)
+
+        with self.assertNumQueries(1):
+            menu_contents = list(get_menu_contents_for_content_objects([self.page, self.poll]))
+
+        self.assertCountEqual(menu_contents, [self.published, self.other])
+
+    def test_no_objects(self):
+        self.assertFalse(get_menu_contents_for_content_objects([]).exists())
+
+
+class ProxyModelTestCase(CMSTestCase):
+    def setUp(self):
+        factories.MenuContentWithVersionFactory()
+        self.version = Version.objects.select_related("created_by").prefetch_related("statetracking_set").get()
+
+    def test_proxy_shares_the_cached_relations(self):
+        with self.assertNumQueries(0):
+            proxy = proxy_model(self.version, MenuContent)
+            created_by = proxy.created_by
+            state_tracking = list(proxy.statetracking_set.all())
+
+        self.assertEqual(proxy.pk, self.version.pk)
+        self.assertIs(created_by, self.version.created_by)
+        self.assertEqual(state_tracking, list(self.version.statetracking_set.all()))
+
+    def test_changing_the_proxy_does_not_change_the_original(self):
+        proxy = proxy_model(self.version, MenuContent)
+        proxy.object_id = 0
+        proxy._state.fields_cache.clear()
+        proxy._prefetched_objects_cache.clear()
+
+        self.assertNotEqual(self.version.object_id, 0)
+        self.assertIn("created_by", self.version._state.fields_cache)
+        self.assertIn("statetracking_set", self.version._prefetched_objects_cache)
+        self.assertIsNot(type(proxy), Version)
+        self.assertIs(type(self.version), Version)
+
+
 class TestNavigationPerformance(CMSTestCase):
 
     def setUp(self):
@@ -1,5 +1,6 @@
 from django.test import TestCase
 
+from djangocms_navigation.models import MenuItem
 from djangocms_navigation.test_utils import factories
 
 
@@ -23,3 +24,30 @@ class MenuContentModelTestCase(TestCase):
     def test_string_representation(self):
         menu_content = factories.MenuContentFactory(root__title="My Title")
         self.assertEqual(str(menu_content), menu_content.title)
+
+
+class MenuItemMenuRootTestCase(TestCase):
+    def test_root_is_its_own_menu_root(self):
+        root = factories.RootMenuItemFactory()
+
+        self.assertEqual(root.menu_root_id, root.pk)
+        self.assertEqual(MenuItem.objects.get(pk=root.pk).menu_root_id, root.pk)
+
+    def test_children_and_siblings_get_the_menu_root(self):
+        root = factories.RootMenuItemFactory()
+        child = factories.ChildMenuItemFactory(parent=root)
+        grandchild = factories.ChildMenuItemFactory(parent=child)
+        sibling = factories.SiblingMenuItemFactory(sibling=child)
+        instance_child = child.add_child(instance=MenuItem(title="Instance"))
+
+        for item in (child, grandchild, sibling, instance_child):
+            self.assertEqual(MenuItem.objects.get(pk=item.pk).menu_root_id, root.pk)
+
+    def test_menu_root_is_found_from_the_path(self):
+        root = factories.RootMenuItemFactory()
+        factories.RootMenuItemFactory()
+        item = MenuItem.objects.create(
+            path=MenuItem._get_path(root.path, 2, 1), depth=2, numchild=0, title="Without menu root"
+        )
+
+        self.assertEqual(item.menu_root_id, root.pk)
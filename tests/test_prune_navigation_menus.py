@@ -0,0 +1,65 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.utils import timezone
+
+from cms.test_utils.testcases import CMSTestCase
+
+from djangocms_versioning.constants import ARCHIVED, PUBLISHED
+from djangocms_versioning.models import Version
+
+from djangocms_navigation.models import MenuContent, MenuItem
+from djangocms_navigation.test_utils import factories
+
+
+class PruneNavigationMenusTestCase(CMSTestCase):
+    def setUp(self):
+        self.old_archived = factories.MenuContentWithVersionFactory(version__state=ARCHIVED)
+        factories.ChildMenuItemFactory.create_batch(3, parent=self.old_archived.root)
+        self.recent_archived = factories.MenuContentWithVersionFactory(version__state=ARCHIVED)
+        self.published = factories.MenuContentWithVersionFactory(version__state=PUBLISHED)
+        self.old_archived_version = self.old_archived.versions.get()
+        Version.objects.filter(pk__in=[self.old_archived_version.pk, self.published.versions.get().pk]).update(
+            modified=timezone.now() - timedelta(days=100)
+        )
+        self.orphaned_root = factories.RootMenuItemFactory()
+        factories.ChildMenuItemFactory(parent=self.orphaned_root)
+
+    def test_prune(self):
+        out = StringIO()
+
+        call_command("prune_navigation_menus", days=90, stdout=out)
+
+        self.assertFalse(MenuContent._base_manager.filter(pk=self.old_archived.pk).exists())
+        self.assertFalse(Version.objects.filter(pk=self.old_archived_version.pk).exists())
+        self.assertFalse(MenuItem._base_manager.filter(path__startswith=self.old_archived.root.path).exists())
+        self.assertFalse(MenuItem._base_manager.filter(path__startswith=self.orphaned_root.path).exists())
+        self.assertTrue(MenuContent._base_manager.filter(pk=self.recent_archived.pk).exists())
+        self.assertEqual(MenuItem.get_tree(self.published.root).count(), 1)
+        self.assertIn("Deleted 6 menu items of 2 menu trees", out.getvalue())
+
+    def test_versions_without_content_are_skipped(self):
+        # The version of a menu content deleted without it
+        Version.objects.filter(pk=self.old_archived_version.pk).update(object_id=self.old_archived.pk + 1000)
+        out = StringIO()
+        err = StringIO()
+
+        call_command("prune_navigation_menus", days=90, stdout=out, stderr=err)
+
+        self.assertIn(
+            "Skipped version {}, its menu content no longer exists".format(self.old_archived_version.pk),
+            err.getvalue(),
+        )
+        self.assertTrue(Version.objects.filter(pk=self.old_archived_version.pk).exists())
+        self.assertIn("Deleted 2 menu items of 1 menu trees", out.getvalue())
+
+    def test_dry_run(self):
+        items = MenuItem._base_manager.count()
+        out = StringIO()
+
+        call_command("prune_navigation_menus", days=90, dry_run=True, stdout=out)
+
+        self.assertTrue(MenuContent._base_manager.filter(pk=self.old_archived.pk).exists())
+        self.assertEqual(MenuItem._base_manager.count(), items)
+        self.assertIn("Would delete 6 menu items of 2 menu trees", out.getvalue())
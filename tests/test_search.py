@@ -0,0 +1,67 @@
+from unittest.mock import patch
+
+from cms.models import Page
+from cms.test_utils.testcases import CMSTestCase
+
+from djangocms_navigation.search import (
+    BaseSearchBackend,
+    PostgresTrigramSearchBackend,
+    SubquerySearchBackend,
+    get_search_backend,
+)
+from djangocms_navigation.test_utils.factories import PageContentFactory
+
+
+PAGE_SEARCH_FIELDS = [
+    "pagecontent_set__title__icontains",
+    "urls__slug__icontains",
+    "urls__path__icontains",
+]
+
+
+class SubquerySearchBackendTestCase(CMSTestCase):
+    def test_search_returns_each_matching_object_once(self):
+        expected = PageContentFactory(title="Test search", language="en")
+        # A second content and a url slug matching the query would duplicate the page in a join
+        PageContentFactory(page=expected.page, title="Test search", language="fr")
+        expected.page.urls.update(slug="test-search")
+        PageContentFactory(title="Something else", language="en")
+
+        results = SubquerySearchBackend().search(Page._base_manager.all(), "test", PAGE_SEARCH_FIELDS)
+
+        self.assertEqual(list(results), [expected.page])
+
+    def test_search_matches_any_search_field(self):
+        by_title = PageContentFactory(title="Test search", language="en")
+        by_path = PageContentFactory(title="Something", language="en")
+        by_path.page.urls.update(path="some/test/path")
+        PageContentFactory(title="Something else", language="en")
+
+        results = SubquerySearchBackend().search(Page._base_manager.all(), "test", PAGE_SEARCH_FIELDS)
+
+        self.assertEqual(set(results), {by_title.page, by_path.page})
+
+
+class PostgresTrigramSearchBackendTestCase(CMSTestCase):
+    def test_icontains_lookups_are_replaced_by_trigram_lookups(self):
+        backend = PostgresTrigramSearchBackend()
+
+        self.assertEqual(
+            backend.get_lookup("pagecontent_set__title__icontains"), "pagecontent_set__title__trigram_word_similar"
+        )
+        self.assertEqual(backend.get_lookup("text"), "text")
+
+
+class GetSearchBackendTestCase(CMSTestCase):
+    def test_base_search_backend_is_abstract(self):
+        with self.assertRaises(TypeError):
+            BaseSearchBackend()
+
+    def test_default_search_backend(self):
+        self.assertIsInstance(get_search_backend(), SubquerySearchBackend)
+
+    @patch(
+        "djangocms_navigation.search.SEARCH_BACKEND", "djangocms_navigation.search.PostgresTrigramSearchBackend"
+    )
+    def test_search_backend_is_configurable(self):
+        self.assertIsInstance(get_search_backend(), PostgresTrigramSearchBackend)
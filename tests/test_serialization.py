@@ -0,0 +1,150 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import CommandError, call_command
+
+from cms.test_utils.testcases import CMSTestCase
+from cms.test_utils.util.fuzzy_int import FuzzyInt
+
+from djangocms_versioning.constants import ARCHIVED, DRAFT
+from djangocms_versioning.exceptions import ConditionFailed
+from djangocms_versioning.models import Version
+
+from djangocms_navigation.models import MenuContent, MenuItem
+from djangocms_navigation.serialization import (
+    JSON,
+    MenuImportError,
+    export_menu_content,
+    import_menu_content,
+)
+from djangocms_navigation.test_utils import factories
+
+
+class MenuContentSerializationTestCase(CMSTestCase):
+    def setUp(self):
+        self.user = self.get_superuser()
+        self.menu_content = factories.MenuContentWithVersionFactory(
+            version__created_by=self.user, version__state=DRAFT, root__title="Main menu",
+        )
+        self.child = factories.ChildMenuItemFactory(parent=self.menu_content.root, title="Products")
+        self.grandchild = factories.ChildMenuItemFactory(parent=self.child, title="Shoes", soft_root=True)
+        self.sibling = factories.ChildMenuItemFactory(
+            parent=self.menu_content.root, title="About", content=None, object_id=None, content_type=None
+        )
+
+    def _get_tree(self, menu_content):
+        return [
+            (item.title, item.depth, item.numchild, item.content_type_id, item.object_id, item.soft_root)
+            for item in MenuItem.get_tree(menu_content.root)
+        ]
+
+    def test_export_ndjson_has_one_record_per_line(self):
+        lines = "".join(export_menu_content(self.menu_content)).splitlines()
+        records = [json.loads(line) for line in lines]
+
+        self.assertEqual(
+            records[0],
+            {
+                "identifier": self.menu_content.menu.identifier,
+                "site": self.menu_content.menu.site_id,
+                "language": self.menu_content.language,
+            },
+        )
+        self.assertEqual(
+            [(r["id"], r["parent"], r["title"]) for r in records[1:]],
+            [
+                (self.menu_content.root.pk, None, "Main menu"),
+                (self.child.pk, self.menu_content.root.pk, "Products"),
+                (self.grandchild.pk, self.child.pk, "Shoes"),
+                (self.sibling.pk, self.menu_content.root.pk, "About"),
+            ],
+        )
+        self.assertEqual(records[2]["content_type"], "cms.pagecontent")
+
+    def test_import_round_trip_creates_a_new_draft(self):
+        export = "".join(export_menu_content(self.menu_content)).splitlines(keepends=True)
+
+        # The number of queries doesn't depend on the number of menu items
+        with self.assertNumQueries(FuzzyInt(1, 30)):
+            new_content = import_menu_content(export, self.user, archive_draft=True)
+
+        self.assertNotEqual(new_content.pk, self.menu_content.pk)
+        self.assertEqual(new_content.menu, self.menu_content.menu)
+        self.assertEqual(self._get_tree(new_content), self._get_tree(self.menu_content))
+        self.assertEqual(Version.objects.get_for_content(new_content).state, DRAFT)
+        self.assertEqual(self.menu_content.versions.get().state, ARCHIVED)
+        self.assertEqual(MenuItem.find_problems(), ([], [], [], [], []))
+
+    def test_import_json_format(self):
+        export = "".join(export_menu_content(self.menu_content, format=JSON)).splitlines(keepends=True)
+
+        new_content = import_menu_content(export, self.user, archive_draft=True)
+
+        self.assertEqual(self._get_tree(new_content), self._get_tree(self.menu_content))
+
+    def test_import_rejects_item_before_parent(self):
+        records = list(export_menu_content(self.menu_content))
+        records[2], records[3] = records[3], records[2]
+
+        with self.assertRaises(MenuImportError):
+            import_menu_content(records, self.user, archive_draft=True)
+        self.assertEqual(MenuContent._base_manager.count(), 1)
+
+    def test_import_refuses_to_archive_the_draft_by_default(self):
+        export = list(export_menu_content(self.menu_content))
+
+        with self.assertRaisesMessage(MenuImportError, "already has a draft"):
+            import_menu_content(export, self.user)
+        self.assertEqual(MenuContent._base_manager.count(), 1)
+        self.assertEqual(self.menu_content.versions.get().state, DRAFT)
+
+    def test_import_does_not_archive_a_draft_the_user_cannot_modify(self):
+        export = list(export_menu_content(self.menu_content))
+
+        with patch.object(Version, "check_modify", side_effect=ConditionFailed("Locked")):
+            with self.assertRaisesMessage(MenuImportError, "can't be archived: Locked"):
+                import_menu_content(export, self.user, archive_draft=True)
+        self.assertEqual(MenuContent._base_manager.count(), 1)
+        self.assertEqual(self.menu_content.versions.get().state, DRAFT)
+
+
+class MenuContentCommandsTestCase(CMSTestCase):
+    def setUp(self):
+        self.user = self.get_superuser()
+        self.menu_content = factories.MenuContentWithVersionFactory(version__created_by=self.user)
+        factories.ChildMenuItemFactory.create_batch(3, parent=self.menu_content.root)
+
+    def test_export_and_import_commands(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "menu.ndjson")
+            call_command("export_navigation_menu", self.menu_content.pk, output=path)
+            out = StringIO()
+            call_command("import_navigation_menu", path, user=self.user.username, archive_draft=True, stdout=out)
+
+        new_content = MenuContent._base_manager.exclude(pk=self.menu_content.pk).get()
+        self.assertIn("as MenuContent {}".format(new_content.pk), out.getvalue())
+        self.assertEqual(new_content.root.get_children_count(), 3)
+
+    def test_export_command_to_stdout(self):
+        out = StringIO()
+
+        call_command("export_navigation_menu", self.menu_content.pk, stdout=out)
+
+        self.assertEqual(len(out.getvalue().splitlines()), 5)
+
+    def test_export_command_unknown_menu_content(self):
+        with self.assertRaises(CommandError):
+            call_command("export_navigation_menu", 9999)
+
+    def test_import_command_fails_on_an_existing_draft(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "menu.ndjson")
+            call_command("export_navigation_menu", self.menu_content.pk, output=path)
+
+            with self.assertRaisesMessage(CommandError, "already has a draft"):
+                call_command("import_navigation_menu", path, user=self.user.username)
+
+        self.assertEqual(MenuContent._base_manager.count(), 1)
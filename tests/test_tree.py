@@ -0,0 +1,159 @@
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import TestCase
+
+from treebeard.exceptions import InvalidMoveToDescendant, InvalidPosition
+
+from djangocms_navigation.models import MenuItem
+from djangocms_navigation.test_utils import factories
+from djangocms_navigation.tree import (
+    clone_menu_tree,
+    clone_menu_tree_in_database,
+    clone_menu_tree_in_python,
+    delete_menu_tree,
+    get_copy_plan,
+    restructure_menu_tree,
+)
+
+
+class RestructureMenuTreeTestCase(TestCase):
+    def setUp(self):
+        self.root = factories.RootMenuItemFactory()
+        self.child1 = factories.ChildMenuItemFactory(parent=self.root)
+        self.child2 = factories.ChildMenuItemFactory(parent=self.root)
+        self.grandchild = factories.ChildMenuItemFactory(parent=self.child1)
+        # A second menu that should never be touched
+        self.other_root = factories.RootMenuItemFactory()
+        self.other_child = factories.ChildMenuItemFactory(parent=self.other_root)
+
+    def _refresh(self):
+        for node in [self.root, self.child1, self.child2, self.grandchild, self.other_root, self.other_child]:
+            node.refresh_from_db()
+
+    def test_moves_are_applied_in_order(self):
+        moves = [
+            {"node_id": self.grandchild.pk, "sibling_id": self.root.pk, "as_child": 1},
+            {"node_id": self.child2.pk, "sibling_id": self.child1.pk, "as_child": 0},
+        ]
+
+        updated = restructure_menu_tree(self.root, moves=moves)
+
+        self._refresh()
+        self.assertEqual(
+            list(self.root.get_children()), [self.child2, self.child1, self.grandchild]
+        )
+        self.assertEqual(self.child1.numchild, 0)
+        self.assertEqual(self.root.numchild, 3)
+        self.assertEqual(updated, 4)
+        self.assertFalse(MenuItem.get_tree(self.root).filter(path__startswith="~").exists())
+        self.assertEqual(MenuItem.find_problems(), ([], [], [], [], []))
+
+    def test_structure_only_updates_changed_nodes(self):
+        structure = [
+            {"node_id": self.child2.pk, "parent_id": self.child1.pk, "position": 0},
+        ]
+
+        updated = restructure_menu_tree(self.root, structure=structure)
+
+        self._refresh()
+        # root and child1 numchild, child2 and grandchild paths
+        self.assertEqual(updated, 4)
+        self.assertEqual(list(self.child1.get_children()), [self.child2, self.grandchild])
+        self.assertEqual(self.other_child.get_parent(), self.other_root)
+
+    def test_unchanged_structure_does_not_update(self):
+        structure = [{"node_id": self.child1.pk, "parent_id": self.root.pk, "position": 0}]
+
+        updated = restructure_menu_tree(self.root, structure=structure)
+
+        self.assertEqual(updated, 0)
+
+    def test_cannot_move_to_descendant(self):
+        moves = [{"node_id": self.child1.pk, "sibling_id": self.grandchild.pk, "as_child": 1}]
+
+        with self.assertRaises(InvalidMoveToDescendant):
+            restructure_menu_tree(self.root, moves=moves)
+
+    def test_cannot_move_outside_of_root(self):
+        moves = [{"node_id": self.child1.pk, "sibling_id": self.root.pk, "as_child": 0}]
+
+        with self.assertRaises(InvalidPosition):
+            restructure_menu_tree(self.root, moves=moves)
+
+    def test_cannot_move_node_of_another_menu(self):
+        moves = [{"node_id": self.other_child.pk, "sibling_id": self.root.pk, "as_child": 1}]
+
+        with self.assertRaises(ValueError):
+            restructure_menu_tree(self.root, moves=moves)
+
+
+class CloneMenuTreeTestCase(TestCase):
+    def setUp(self):
+        self.root = factories.RootMenuItemFactory()
+        child1 = factories.ChildMenuItemFactory(parent=self.root, soft_root=True)
+        factories.ChildMenuItemFactory(parent=self.root, hide_node=True, link_target="_blank")
+        grandchild = factories.ChildMenuItemFactory(parent=child1)
+        factories.ChildMenuItemFactory(parent=grandchild)
+        # A second menu that must not be copied
+        factories.ChildMenuItemFactory(parent=factories.RootMenuItemFactory())
+        self.new_root = MenuItem.add_root(title=self.root.title, numchild=self.root.numchild)
+
+    def _get_tree_values(self, root):
+        fields = ["path", "depth", "numchild", "title", "link_target", "content_type", "object_id", "soft_root",
+                  "hide_node"]
+        return [
+            dict(values, path=values["path"][len(root.path):])
+            for values in MenuItem.get_tree(root).exclude(pk=root.pk).values(*fields)
+        ]
+
+    def assertTreeIsCloned(self):
+        self.assertEqual(self._get_tree_values(self.new_root), self._get_tree_values(self.root))
+        self.assertEqual(
+            set(MenuItem.get_tree(self.new_root).values_list("menu_root", flat=True)), {self.new_root.pk}
+        )
+
+    def test_clone_in_database(self):
+        self.assertTrue(clone_menu_tree_in_database(self.root, self.new_root))
+
+        self.assertTreeIsCloned()
+
+    def test_clone_in_python(self):
+        clone_menu_tree_in_python(self.root, self.new_root)
+
+        self.assertTreeIsCloned()
+
+    def test_clone_in_python_does_not_load_model_instances(self):
+        with patch.object(MenuItem, "from_db") as mocked_from_db:
+            clone_menu_tree_in_python(self.root, self.new_root)
+
+        mocked_from_db.assert_not_called()
+        self.assertTreeIsCloned()
+
+    def test_copy_plan_is_computed_once_per_model(self):
+        self.assertIs(get_copy_plan(MenuItem, exclude=("path",)), get_copy_plan(MenuItem, exclude=("path",)))
+        self.assertNotIn("id", [field.name for field in get_copy_plan(MenuItem)])
+
+    def test_clone_falls_back_to_python_for_unsupported_backends(self):
+        with patch.object(connection, "vendor", "unsupported"):
+            self.assertFalse(clone_menu_tree_in_database(self.root, self.new_root))
+            clone_menu_tree(self.root, self.new_root)
+
+        self.assertTreeIsCloned()
+
+
+class DeleteMenuTreeTestCase(TestCase):
+    def setUp(self):
+        self.root = factories.RootMenuItemFactory()
+        child = factories.ChildMenuItemFactory(parent=self.root)
+        factories.ChildMenuItemFactory.create_batch(3, parent=child)
+        factories.ChildMenuItemFactory(parent=self.root)
+        self.other_root = factories.RootMenuItemFactory()
+        factories.ChildMenuItemFactory(parent=self.other_root)
+
+    def test_delete_in_batches(self):
+        counts = list(delete_menu_tree(self.root, batch_size=2))
+
+        self.assertEqual(counts, [2, 2, 2])
+        self.assertFalse(MenuItem._base_manager.filter(path__startswith=self.root.path).exists())
+        self.assertEqual(MenuItem.get_tree(self.other_root).count(), 2)
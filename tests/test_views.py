@@ -2,6 +2,7 @@ from unittest.mock import patch
 
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.sites.models import Site
+from django.core.cache import cache
 from django.test import override_settings
 
 from cms.models import Page, PageContent, User
@@ -9,12 +10,20 @@ from cms.test_utils.testcases import CMSTestCase
 from cms.utils import get_current_site
 from cms.utils.urlutils import admin_reverse
 
-from djangocms_versioning.constants import PUBLISHED
+from djangocms_versioning.constants import ARCHIVED, PUBLISHED, UNPUBLISHED
 from faker import Faker
 
-from djangocms_navigation.constants import SELECT2_CONTENT_OBJECT_URL_NAME
+from djangocms_navigation.cache import (
+    get_select2_cache_generation,
+    invalidate_select2_cache,
+)
+from djangocms_navigation.constants import (
+    SEARCH_CONTENT_OBJECT_URL_NAME,
+    SELECT2_CONTENT_OBJECT_URL_NAME,
+)
 from djangocms_navigation.models import MenuContent
 from djangocms_navigation.test_utils.factories import (
+    ChildMenuItemFactory,
     MenuContentFactory,
     PageContentFactory,
     PageContentWithVersionFactory,
@@ -204,10 +213,49 @@ class ContentObjectAutoFillTestCases(CMSTestCase):
             )
         self.assertEqual(response.status_code, 200)
         expected_json = {
-            "results": [{"text": "example1", "id": 1}, {"text": "example2", "id": 2}]
+            "results": [{"text": "example1", "id": 1}, {"text": "example2", "id": 2}],
+            "more": False,
         }
         self.assertEqual(response.json(), expected_json)
 
+    @patch("djangocms_navigation.views.SELECT2_PAGE_SIZE", 2)
+    def test_select2_view_is_paginated(self):
+        poll_content_contenttype_id = ContentType.objects.get_for_model(PollContent).id
+        poll = Poll.objects.create(name="Test poll")
+        poll_contents = [
+            PollContent.objects.create(poll=poll, language="en", text="example{}".format(i)) for i in range(3)
+        ]
+
+        with self.login_user_context(self.superuser):
+            first_page = self.client.get(
+                self.select2_endpoint, data={"content_type_id": poll_content_contenttype_id}
+            ).json()
+            second_page = self.client.get(
+                self.select2_endpoint, data={"content_type_id": poll_content_contenttype_id, "page": 2}
+            ).json()
+
+        self.assertEqual([r["id"] for r in first_page["results"]], [p.pk for p in poll_contents[:2]])
+        self.assertTrue(first_page["more"])
+        self.assertEqual([r["id"] for r in second_page["results"]], [poll_contents[2].pk])
+        self.assertFalse(second_page["more"])
+
+    @patch("djangocms_navigation.views.SELECT2_PAGE_SIZE", 2)
+    def test_select2_view_reads_following_pages_after_the_last_pk(self):
+        poll_content_contenttype_id = ContentType.objects.get_for_model(PollContent).id
+        poll = Poll.objects.create(name="Test poll")
+        poll_contents = [
+            PollContent.objects.create(poll=poll, language="en", text="example{}".format(i)) for i in range(5)
+        ]
+
+        with self.login_user_context(self.superuser):
+            response = self.client.get(
+                self.select2_endpoint,
+                data={"content_type_id": poll_content_contenttype_id, "page": 2, "after": poll_contents[0].pk},
+            ).json()
+
+        self.assertEqual([r["id"] for r in response["results"]], [p.pk for p in poll_contents[1:3]])
+        self.assertTrue(response["more"])
+
     def test_select2_poll_content_view_pk(self):
         site = Site.objects.create(name="foo.com", domain="foo.com")
         poll_content_contenttype_id = ContentType.objects.get_for_model(PollContent).id
@@ -226,7 +274,7 @@ class ContentObjectAutoFillTestCases(CMSTestCase):
                 },
             )
         self.assertEqual(response.status_code, 200)
-        expected_json = {"results": [{"text": "example", "id": 1}]}
+        expected_json = {"results": [{"text": "example", "id": 1}], "more": False}
         self.assertEqual(response.json(), expected_json)
 
     @override_settings(DJANGOCMS_NAVIGATION_VERSIONING_ENABLED=True)
@@ -368,6 +416,160 @@ class ContentObjectAutoFillTestCases(CMSTestCase):
         self.assertEqual(len(results), 1)
         self.assertEqual(results, [{"id": expected.page.id, "text": "Test search by overwritten url"}])
 
+    def test_pages_are_filtered_by_the_state_of_their_latest_version(self):
+        """
+        Check that pages whose latest version in the language is archived or unpublished are not returned
+        """
+        page_contenttype_id = ContentType.objects.get_for_model(Page).id
+        published = PageContentWithVersionFactory(language="en", version__state=PUBLISHED)
+        PageContentWithVersionFactory(language="en", version__state=ARCHIVED)
+        PageContentWithVersionFactory(language="en", version__state=UNPUBLISHED)
+        # An archived version followed by a new draft is listed
+        redrafted = PageContentWithVersionFactory(language="en", version__state=ARCHIVED)
+        redrafted.versions.get().copy(self.superuser)
+        # Only the state of the versions in the request language matters
+        other_language = PageContentWithVersionFactory(language="en", version__state=PUBLISHED)
+        PageContentWithVersionFactory(page=other_language.page, language="fr", version__state=ARCHIVED)
+
+        with self.login_user_context(self.superuser):
+            response = self.client.get(
+                self.select2_endpoint,
+                data={"content_type_id": page_contenttype_id},
+            )
+            results = response.json()["results"]
+
+        self.assertEqual(
+            sorted(result["id"] for result in results),
+            sorted([published.page.pk, redrafted.page.pk, other_language.page.pk]),
+        )
+
+
+class ContentObjectSearchViewTestCase(CMSTestCase):
+    def setUp(self):
+        self.search_endpoint = admin_reverse(SEARCH_CONTENT_OBJECT_URL_NAME)
+        self.superuser = self.get_superuser()
+        self.page_contenttype_id = ContentType.objects.get_for_model(Page).id
+        self.poll_content_contenttype_id = ContentType.objects.get_for_model(PollContent).id
+
+    def test_search_view_anonymous_user(self):
+        response = self.client.get(self.search_endpoint, data={"query": "test"})
+
+        self.assertEqual(response.status_code, 302)
+
+    def test_search_view_without_query(self):
+        with self.login_user_context(self.superuser):
+            response = self.client.get(self.search_endpoint)
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_search_view_returns_results_of_every_content_type_by_relevance(self):
+        page_content = PageContentFactory(title="About test", menu_title="About test", language="en")
+        poll = Poll.objects.create(name="Test poll")
+        poll_content = PollContent.objects.create(poll=poll, language="en", text="test")
+        PageContentFactory(title="Other", menu_title="Other", language="en")
+
+        with self.login_user_context(self.superuser):
+            response = self.client.get(self.search_endpoint, data={"query": "test"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["results"], [
+            {
+                "id": "{}:{}".format(self.poll_content_contenttype_id, poll_content.pk),
+                "text": "test",
+                "content_type_id": self.poll_content_contenttype_id,
+                "object_id": poll_content.pk,
+                "type": "poll content",
+            },
+            {
+                "id": "{}:{}".format(self.page_contenttype_id, page_content.page.pk),
+                "text": "About test",
+                "content_type_id": self.page_contenttype_id,
+                "object_id": page_content.page.pk,
+                "type": "page",
+            },
+        ])
+
+    @patch("djangocms_navigation.views.SELECT2_PAGE_SIZE", 1)
+    def test_search_view_keeps_the_most_relevant_results_of_each_content_type(self):
+        PageContentFactory(title="Contest", menu_title="Contest", language="en")
+        PageContentFactory(title="Test page", menu_title="Test page", language="en")
+        exact = PageContentFactory(title="test", menu_title="test", language="en")
+
+        with self.login_user_context(self.superuser):
+            results = self.client.get(self.search_endpoint, data={"query": "test"}).json()["results"]
+
+        self.assertEqual(
+            [result["object_id"] for result in results if result["content_type_id"] == self.page_contenttype_id],
+            [exact.page.pk],
+        )
+
+    @patch("djangocms_navigation.views.SELECT2_PAGE_SIZE", 2)
+    def test_search_view_limits_the_results_of_each_content_type(self):
+        PageContentFactory.create_batch(3, title="test", menu_title="test", language="en")
+        poll = Poll.objects.create(name="Test poll")
+        PollContent.objects.create(poll=poll, language="en", text="test")
+
+        with self.login_user_context(self.superuser):
+            results = self.client.get(self.search_endpoint, data={"query": "test"}).json()["results"]
+
+        self.assertEqual(
+            [result["content_type_id"] for result in results].count(self.page_contenttype_id), 2
+        )
+        self.assertEqual(
+            [result["content_type_id"] for result in results].count(self.poll_content_contenttype_id), 1
+        )
+
+
+@patch("djangocms_navigation.views.SELECT2_CACHE_TTL", 30)
+class ContentObjectSelect2ViewCacheTestCase(CMSTestCase):
+    def setUp(self):
+        cache.clear()
+        self.select2_endpoint = admin_reverse(SELECT2_CONTENT_OBJECT_URL_NAME)
+        self.superuser = self.get_superuser()
+        self.page_contenttype_id = ContentType.objects.get_for_model(Page).id
+
+    def _search(self, query):
+        with self.login_user_context(self.superuser):
+            response = self.client.get(
+                self.select2_endpoint,
+                data={"content_type_id": self.page_contenttype_id, "query": query},
+            )
+        return [result["id"] for result in response.json()["results"]]
+
+    def test_results_are_cached(self):
+        page_content = PageContentFactory(title="test", language="en")
+
+        self.assertEqual(self._search("test"), [page_content.page.pk])
+        PageContentFactory(title="test2", language="en")
+
+        self.assertEqual(self._search("test"), [page_content.page.pk])
+
+    def test_cached_results_are_invalidated_for_the_content_type(self):
+        page_content = PageContentFactory(title="test", language="en")
+        self._search("test")
+        new_page_content = PageContentFactory(title="test2", language="en")
+
+        invalidate_select2_cache(self.page_contenttype_id)
+
+        self.assertEqual(self._search("test"), [page_content.page.pk, new_page_content.page.pk])
+
+    def test_query_extending_a_cached_query_is_narrowed_to_its_results(self):
+        page_content = PageContentFactory(title="test", language="en")
+        PageContentFactory(title="other", language="en")
+        self.assertEqual(self._search("te"), [page_content.page.pk])
+        # Created after the prefix was cached, so it is not found until the prefix expires
+        PageContentFactory(title="test2", language="en")
+
+        self.assertEqual(self._search("tes"), [page_content.page.pk])
+
+    def test_publishing_a_version_invalidates_the_cached_results(self):
+        page_content = PageContentWithVersionFactory(language="en")
+        generation = get_select2_cache_generation(self.page_contenttype_id)
+
+        page_content.versions.get().publish(self.superuser)
+
+        self.assertNotEqual(get_select2_cache_generation(self.page_contenttype_id), generation)
+
 
 class ContentObjectSelect2ViewGetDataTestCase(CMSTestCase):
     """
@@ -408,15 +610,17 @@ class ContentObjectSelect2ViewGetDataTestCase(CMSTestCase):
         mock_distinct.assert_called_once()
 
     @patch("django.db.models.QuerySet.distinct")
-    def test_distinct_called_with_search_query(self, mock_distinct):
+    def test_distinct_not_called_with_search_query(self, mock_distinct):
         """
-        Mock distinct to assert that it is called if there is a search query in the request
+        Mock distinct to assert that it is not called for a search query, the search backend matches the
+        search fields with subqueries that don't duplicate the results
         """
-        self.request.GET = {"content_type_id": self.page_contenttype_id, "query": "test query"}
+        poll_content_contenttype_id = ContentType.objects.get_for_model(PollContent).id
+        self.request.GET = {"content_type_id": poll_content_contenttype_id, "query": "test query"}
 
         self.view.get_data()
 
-        mock_distinct.assert_called_once()
+        mock_distinct.assert_not_called()
 
     def test_results_unfiltered_without_search_fields(self):
         """
@@ -562,3 +766,66 @@ class ContentObjectSelect2ViewGetDataTestCase(CMSTestCase):
         self.assertEqual(Page._base_manager.count(), 100)
         self.assertEqual(results.count(), 1)
         self.assertIn(expected, results)
+
+
+class MenuItemSelect2ViewTestCase(CMSTestCase):
+    def setUp(self):
+        self.menu_content = MenuContentFactory()
+        self.select2_endpoint = admin_reverse(
+            "djangocms_navigation_menuitem_select2", args=[self.menu_content.pk]
+        )
+        self.superuser = self.get_superuser()
+
+    def test_select2_view_anonymous_user(self):
+        response = self.client.get(self.select2_endpoint)
+        expected_url = "/en/admin/login/?next=" + self.select2_endpoint
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response.url, expected_url)
+
+    def test_select2_view_non_existing_menu_content(self):
+        with self.login_user_context(self.superuser):
+            response = self.client.get(
+                admin_reverse("djangocms_navigation_menuitem_select2", args=[9999])
+            )
+        self.assertEqual(response.status_code, 404)
+
+    def test_select2_view_only_returns_items_of_the_menu_root(self):
+        child = ChildMenuItemFactory(parent=self.menu_content.root, title="child")
+        ChildMenuItemFactory(parent=MenuContentFactory().root)
+
+        with self.login_user_context(self.superuser):
+            response = self.client.get(self.select2_endpoint)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json()["results"],
+            [
+                {"id": self.menu_content.root.pk, "text": self.menu_content.root.title},
+                {"id": child.pk, "text": "- child"},
+            ],
+        )
+        self.assertFalse(response.json()["more"])
+
+    def test_select2_view_search_and_pk(self):
+        child = ChildMenuItemFactory(parent=self.menu_content.root, title="Products")
+        ChildMenuItemFactory(parent=self.menu_content.root, title="About us")
+
+        with self.login_user_context(self.superuser):
+            search_response = self.client.get(self.select2_endpoint, data={"query": "prod"})
+            pk_response = self.client.get(self.select2_endpoint, data={"pk": child.pk})
+
+        self.assertEqual([r["id"] for r in search_response.json()["results"]], [child.pk])
+        self.assertEqual([r["id"] for r in pk_response.json()["results"]], [child.pk])
+
+    @patch("djangocms_navigation.views.SELECT2_PAGE_SIZE", 2)
+    def test_select2_view_is_paginated(self):
+        ChildMenuItemFactory.create_batch(3, parent=self.menu_content.root)
+
+        with self.login_user_context(self.superuser):
+            first_page = self.client.get(self.select2_endpoint).json()
+            last_page = self.client.get(self.select2_endpoint, data={"page": 2}).json()
+
+        self.assertEqual(len(first_page["results"]), 2)
+        self.assertTrue(first_page["more"])
+        self.assertEqual(len(last_page["results"]), 2)
+        self.assertFalse(last_page["more"])
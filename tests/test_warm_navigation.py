@@ -0,0 +1,48 @@
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import override_settings
+
+from cms.test_utils.testcases import CMSTestCase
+from cms.utils import get_current_site
+
+from djangocms_versioning.constants import PUBLISHED
+
+from djangocms_navigation.cache import get_cached_navigation_nodes
+from djangocms_navigation.test_utils import factories
+
+
+@patch("djangocms_navigation.management.commands.warm_navigation.NODE_CACHE_TTL", 60)
+@patch("djangocms_navigation.cache.NODE_CACHE_TTL", 60)
+class WarmNavigationTestCase(CMSTestCase):
+    def setUp(self):
+        cache.clear()
+        self.site = get_current_site()
+        self.menu_content = factories.MenuVersionFactory(
+            content__language="en", content__menu__site=self.site, state=PUBLISHED
+        ).content
+        factories.ChildMenuItemFactory.create_batch(2, parent=self.menu_content.root)
+
+    def test_nodes_of_every_language_are_cached(self):
+        out = StringIO()
+
+        call_command("warm_navigation", site=[self.site.pk], stdout=out)
+
+        self.assertEqual(len(get_cached_navigation_nodes(self.site.pk, "en")), 3)
+        self.assertEqual(get_cached_navigation_nodes(self.site.pk, "fr"), [])
+        self.assertIn("en {}: 2 menu items".format(self.menu_content.menu.root_id), out.getvalue())
+        self.assertIn("Warmed 1 sites", out.getvalue())
+
+    def test_disabled_cache(self):
+        with patch("djangocms_navigation.management.commands.warm_navigation.NODE_CACHE_TTL", 0):
+            with self.assertRaises(CommandError):
+                call_command("warm_navigation")
+
+    @override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+    def test_several_processes_require_a_shared_cache(self):
+        with self.assertRaisesMessage(CommandError, "LocMemCache cache backend isn't shared between processes"):
+            call_command("warm_navigation", processes=2)
+
+        self.assertIsNone(get_cached_navigation_nodes(self.site.pk, "en"))